@@ -0,0 +1,301 @@
+import time
+
+import numpy as np
+
+# Exact classical TSP baselines for TSP_Optimization_VQE.ipynb.
+#
+# Both solvers take the same `adj_matrix` as brute_force_tsp and return
+# (best_distance, best_order) with best_order starting at city 0.
+#
+#   held_karp          bitmask dynamic programming, vectorised with NumPy over
+#                      all subsets of one size at a time; O(2^n n^2) time and
+#                      O(2^n n) memory, practical up to about 20 cities.
+#   branch_and_bound   depth-first search with 1-tree lower bounds, using
+#                      Held-Karp (subgradient) node penalties computed once at
+#                      the root; memory stays small, so it also handles larger
+#                      instances with good structure. Symmetric matrices only:
+#                      1-trees and 2-opt assume w[i, j] == w[j, i].
+
+
+def tour_distance(adj_matrix, order):
+    w = np.asarray(adj_matrix)
+    order = np.asarray(order)
+    return float(w[order, np.roll(order, -1)].sum())
+
+
+def held_karp(adj_matrix):
+    """Exact TSP by Held-Karp DP.
+
+    dp[S, j] is the shortest path that starts at city 0, visits exactly the
+    cities in bitmask S (over cities 1..n-1) and ends at city j + 1.
+    """
+    w = np.asarray(adj_matrix, dtype=float)
+    n = len(w)
+    if n <= 3:
+        order = tuple(range(n))
+        return tour_distance(w, order), order
+    m = n - 1                                           # cities 1..n-1 -> bits 0..m-1
+    inner = w[1:, 1:]
+    dp = np.full((1 << m, m), np.inf)
+    parent = np.full((1 << m, m), -1, dtype=np.int8)
+    singles = 1 << np.arange(m)
+    dp[singles, np.arange(m)] = w[0, 1:]
+
+    masks = np.arange(1 << m)
+    popcount = np.zeros(1 << m, dtype=np.int64)
+    for b in range(m):
+        popcount += (masks >> b) & 1
+
+    for size in range(2, m + 1):
+        layer = masks[popcount == size]
+        for j in range(m):
+            S = layer[(layer >> j) & 1 == 1]
+            prev = S ^ (1 << j)
+            # best predecessor k for every subset at once; dp is inf where k is not in prev
+            cand = dp[prev] + inner[:, j]
+            k = np.argmin(cand, axis=1)
+            dp[S, j] = cand[np.arange(len(S)), k]
+            parent[S, j] = k
+
+    full = (1 << m) - 1
+    closing = dp[full] + w[1:, 0]
+    j = int(np.argmin(closing))
+    best = float(closing[j])
+
+    order = []
+    S = full
+    while j >= 0:
+        order.append(j + 1)
+        S, j = S ^ (1 << j), int(parent[S, j])
+    return best, (0,) + tuple(order[::-1])
+
+
+def _mst_weight(w, nodes):
+    """Prim's algorithm on the complete graph induced by `nodes`."""
+    k = len(nodes)
+    if k <= 1:
+        return 0.0
+    sub = w[np.ix_(nodes, nodes)]
+    in_tree = np.zeros(k, dtype=bool)
+    in_tree[0] = True
+    dist = sub[0].copy()
+    total = 0.0
+    for _ in range(k - 1):
+        d = np.where(in_tree, np.inf, dist)
+        v = int(np.argmin(d))
+        total += d[v]
+        in_tree[v] = True
+        dist = np.minimum(dist, sub[v])
+    return total
+
+
+def _one_tree(w):
+    """Minimum 1-tree rooted at city 0: (weight, degree of every node)."""
+    n = len(w)
+    in_tree = np.zeros(n, dtype=bool)
+    in_tree[0] = True
+    in_tree[1] = True
+    dist = w[1].copy()
+    link = np.full(n, 1)
+    degree = np.zeros(n)
+    total = 0.0
+    for _ in range(n - 2):
+        d = np.where(in_tree, np.inf, dist)
+        d[0] = np.inf
+        v = int(np.argmin(d))
+        total += d[v]
+        degree[v] += 1
+        degree[link[v]] += 1
+        in_tree[v] = True
+        closer = w[v] < dist
+        dist = np.where(closer, w[v], dist)
+        link = np.where(closer, v, link)
+    two = np.argsort(w[0, 1:])[:2] + 1
+    total += w[0, two].sum()
+    degree[two] += 1
+    degree[0] = 2
+    return total, degree
+
+
+def held_karp_bound(adj_matrix, iterations=100):
+    """Subgradient optimisation of the 1-tree bound. Returns (lower bound, node penalties pi)."""
+    w = np.asarray(adj_matrix, dtype=float)
+    n = len(w)
+    pi = np.zeros(n)
+    best_bound, best_pi = -np.inf, pi.copy()
+    step = 2.0 * w.mean()
+    for _ in range(iterations):
+        weight, degree = _one_tree(w + pi[:, None] + pi[None, :])
+        bound = weight - 2 * pi.sum()
+        if bound > best_bound:
+            best_bound, best_pi = bound, pi.copy()
+        g = degree - 2
+        if not g.any():
+            break                                        # the 1-tree is a tour: bound is exact
+        pi += step * g / np.sqrt((g ** 2).sum())
+        step *= 0.95
+    return best_bound, best_pi
+
+
+def _two_opt_tour(w):
+    """Nearest neighbour tour followed by 2-opt, used as the initial upper bound (symmetric w only)."""
+    n = len(w)
+    tour = [0]
+    left = set(range(1, n))
+    while left:
+        nxt = min(left, key=lambda c: w[tour[-1], c])
+        tour.append(nxt)
+        left.remove(nxt)
+    tour = np.array(tour)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(n - 2):
+            a, b = tour[i], tour[i + 1]
+            c, d = tour[i + 2:], np.roll(tour, -1)[i + 2:]
+            delta = w[a, c] + w[b, d] - w[a, b] - w[c, d]
+            if i == 0:
+                delta[-1] = 0.0
+            j = int(np.argmin(delta))
+            if delta[j] < -1e-9:
+                tour[i + 1:i + 3 + j] = tour[i + 1:i + 3 + j][::-1]
+                improved = True
+    return tour
+
+
+def branch_and_bound(adj_matrix, iterations=100, return_stats=False):
+    """Exact TSP by depth-first branch and bound.
+
+    Distances are first shifted by Held-Karp node penalties pi
+    (w'_ij = w_ij + pi_i + pi_j changes every tour by the same 2 * sum(pi)),
+    which makes the 1-tree-style bound much tighter. A partial path
+    0 -> ... -> last with unvisited cities R is pruned when
+        cost(path) + MST(R) + min_r w'[last, r] + min_r w'[r, 0]
+    cannot beat the incumbent.
+
+    Only for symmetric distance matrices: the MST / 1-tree bound and the
+    2-opt starting tour assume w[i, j] == w[j, i], so asymmetric input raises
+    ValueError (held_karp solves those exactly).
+    """
+    w0 = np.asarray(adj_matrix, dtype=float)
+    n = len(w0)
+    if not np.allclose(w0, w0.T):
+        raise ValueError("branch_and_bound needs a symmetric distance matrix; use held_karp for asymmetric ones")
+    if n <= 3:
+        order = tuple(range(n))
+        return (tour_distance(w0, order), order) + (({"nodes": 0},) if return_stats else ())
+    root_bound, pi = held_karp_bound(w0, iterations)
+    w = w0 + pi[:, None] + pi[None, :]
+    shift = 2 * pi.sum()
+
+    incumbent = _two_opt_tour(w0)
+    best = tour_distance(w, incumbent)
+    best_order = tuple(int(c) for c in incumbent)
+    nodes = 0
+
+    path = [0]
+    visited = np.zeros(n, dtype=bool)
+    visited[0] = True
+
+    def search(cost):
+        nonlocal best, best_order, nodes
+        nodes += 1
+        last = path[-1]
+        remaining = np.flatnonzero(~visited)
+        if len(remaining) == 0:
+            total = cost + w[last, 0]
+            if total < best - 1e-9:
+                best, best_order = total, tuple(path)
+            return
+        bound = (cost + _mst_weight(w, remaining) + w[last, remaining].min() + w[remaining, 0].min())
+        if bound >= best - 1e-9:
+            return
+        # Penalised edges may be negative, so only the bound above is used for pruning
+        for city in remaining[np.argsort(w[last, remaining])]:
+            path.append(int(city))
+            visited[city] = True
+            search(cost + w[last, city])
+            visited[city] = False
+            path.pop()
+
+    search(0.0)
+    result = (tour_distance(w0, best_order), best_order)
+    if return_stats:
+        return result + ({"nodes": nodes, "root_bound": root_bound, "shift": shift},)
+    return result
+
+
+def _quantum_solvers(adj_matrix, vqe_maxiter):
+    """Runs NumPyMinimumEigensolver and SamplingVQE exactly as in the notebook."""
+    from qiskit_algorithms import NumPyMinimumEigensolver
+    from qiskit_optimization.applications import Tsp
+    from qiskit_optimization.converters import QuadraticProgramToQubo
+
+    n = len(adj_matrix)
+    tsp = Tsp(_graph(adj_matrix))
+    qubo = QuadraticProgramToQubo().convert(tsp.to_quadratic_program())
+    qubitOp, offset = qubo.to_ising()
+    rows = []
+
+    start = time.perf_counter()
+    result = NumPyMinimumEigensolver().compute_minimum_eigenvalue(qubitOp)
+    elapsed = time.perf_counter() - start
+    x = tsp.sample_most_likely(result.eigenstate)
+    z = tsp.interpret(x)
+    rows.append(("NumPyMinimumEigensolver", _value(tsp, z, adj_matrix, qubo, x), elapsed))
+
+    if vqe_maxiter:
+        from qiskit.circuit.library import TwoLocal
+        from qiskit.primitives import Sampler
+        from qiskit_algorithms import SamplingVQE
+        from qiskit_algorithms.optimizers import SPSA
+        from qiskit_algorithms.utils import algorithm_globals
+
+        algorithm_globals.random_seed = 123
+        ry = TwoLocal(qubitOp.num_qubits, "ry", "cz", reps=5, entanglement="linear")
+        vqe = SamplingVQE(sampler=Sampler(), ansatz=ry, optimizer=SPSA(maxiter=vqe_maxiter))
+        start = time.perf_counter()
+        result = vqe.compute_minimum_eigenvalue(qubitOp)
+        elapsed = time.perf_counter() - start
+        x = tsp.sample_most_likely(result.eigenstate)
+        z = tsp.interpret(x)
+        rows.append((f"SamplingVQE (SPSA {vqe_maxiter})", _value(tsp, z, adj_matrix, qubo, x), elapsed))
+    return rows
+
+
+def _graph(adj_matrix):
+    import networkx as nx
+
+    return nx.from_numpy_array(np.asarray(adj_matrix))
+
+
+def _value(tsp, z, adj_matrix, qubo, x):
+    if not qubo.is_feasible(x) or len(set(z)) != len(adj_matrix):
+        return np.nan
+    return float(tsp.tsp_value(z, adj_matrix))
+
+
+def benchmark(sizes=(3, 4, 8, 12, 15, 18, 20), seed=123, quantum_max_n=4, vqe_max_n=3, vqe_maxiter=300):
+    """Prints a table of distance and wall time per solver on Tsp.create_random_instance graphs.
+
+    Quantum solvers need n^2 qubits, so they only run up to quantum_max_n
+    (NumPyMinimumEigensolver) and vqe_max_n (SamplingVQE) cities.
+    """
+    import networkx as nx
+    from qiskit_optimization.applications import Tsp
+
+    print(f"{'n':>3} {'solver':<28} {'distance':>10} {'gap':>7} {'time [s]':>10}")
+    for n in sizes:
+        adj_matrix = nx.to_numpy_array(Tsp.create_random_instance(n, seed=seed).graph)
+        rows = []
+        start = time.perf_counter()
+        optimum, _ = held_karp(adj_matrix)
+        rows.append(("Held-Karp", optimum, time.perf_counter() - start))
+        start = time.perf_counter()
+        distance, _, stats = branch_and_bound(adj_matrix, return_stats=True)
+        rows.append((f"Branch and bound ({stats['nodes']} nodes)", distance, time.perf_counter() - start))
+        if n <= quantum_max_n:
+            rows += _quantum_solvers(adj_matrix, vqe_maxiter if n <= vqe_max_n else 0)
+        for name, distance, elapsed in rows:
+            gap = distance / optimum - 1 if np.isfinite(distance) else np.nan
+            print(f"{n:3d} {name:<28} {distance:10.1f} {gap:7.1%} {elapsed:10.3f}")
@@ -0,0 +1,265 @@
+import argparse
+import time
+
+import numpy as np
+
+# N-Queens engine for N-queens.ipynb: exact classical enumeration and a
+# Grover simulation whose oracle marks only the true solutions.
+#
+# Solutions are found by bitmask backtracking: `cols`, `diag` and `anti`
+# are bitmasks of attacked squares in the current row, so the free squares
+# are ~(cols | diag | anti) and each placement is a few shifts. Symmetry
+# reduction: only first-row columns in the left half are searched and every
+# solution found there is mirrored (the middle column of odd n is searched
+# once and not mirrored), halving the tree.
+#
+# Board encodings, with wire 0 as the most significant bit like PennyLane
+# and the notebook's format(index, f"0{n**2}b"):
+#   "onehot"   n^2 qubits, wire r*n + c is the square (r, c)
+#   "compact"  n * ceil(log2 n) qubits, wires r*b .. r*b+b-1 hold the
+#              column of the queen in row r (rows with a queen in every row
+#              and column >= n never are solutions)
+# The oracle is a diagonal phase mask over the whole register; Grover then
+# needs no circuit at all. Spaces of up to DENSE_MAX_QUBITS qubits can be
+# simulated as dense vectors, and any size exactly in closed form (one
+# amplitude for the marked states, one for the rest).
+
+DENSE_MAX_QUBITS = 26
+
+
+def _search(n, row, cols, diag, anti, placed, full, out, first_cols):
+    if row == n:
+        out.append(placed.copy())
+        return
+    free = (first_cols if row == 0 else full) & ~(cols | diag | anti)
+    while free:
+        bit = free & -free
+        free ^= bit
+        placed[row] = bit.bit_length() - 1
+        _search(n, row + 1, cols | bit, ((diag | bit) << 1) & full, (anti | bit) >> 1, placed, full, out,
+                first_cols)
+
+
+def solve_all(n):
+    """All N-Queens solutions as an (S, n) array; row r of a solution is the queen's column in row r."""
+    if n < 1:
+        return np.zeros((0, n), dtype=np.int64)
+    full = (1 << n) - 1
+    half = (1 << (n // 2)) - 1                                   # first-row columns 0 .. n//2 - 1
+    found = []
+    _search(n, 0, 0, 0, 0, [0] * n, full, found, half)
+    mirrored = [[n - 1 - c for c in s] for s in found]
+    middle = []
+    if n % 2:
+        _search(n, 0, 0, 0, 0, [0] * n, full, middle, 1 << (n // 2))
+    solutions = np.array(found + mirrored + middle, dtype=np.int64).reshape(-1, n)
+    return solutions[np.lexsort(solutions.T[::-1])]
+
+
+def count_solutions(n):
+    """Number of N-Queens solutions (same mirrored search, counting only)."""
+    if n < 1:
+        return 0
+    full = (1 << n) - 1
+
+    def count(cols, diag, anti, first):
+        if cols == full:
+            return 1
+        free = first & ~(cols | diag | anti)
+        total = 0
+        while free:
+            bit = free & -free
+            free ^= bit
+            total += count(cols | bit, ((diag | bit) << 1) & full, (anti | bit) >> 1, full)
+        return total
+
+    total = 2 * count(0, 0, 0, (1 << (n // 2)) - 1)
+    if n % 2:
+        total += count(0, 0, 0, 1 << (n // 2))
+    return total
+
+
+def _symmetries(solution):
+    """The 8 images of a solution under the symmetries of the square, as tuples."""
+    n = len(solution)
+    rows = np.arange(n)
+    board = np.zeros((n, n), dtype=bool)
+    board[rows, solution] = True
+    images = []
+    for b in (board, board.T):
+        for k in range(4):
+            images.append(tuple(np.argmax(np.rot90(b, k), axis=1)))
+    return images
+
+
+def fundamental_solutions(n):
+    """One representative (the lexicographically smallest image) per symmetry class."""
+    return sorted({min(_symmetries(s)) for s in solve_all(n)})
+
+
+def qubits(n, encoding="onehot"):
+    if encoding == "onehot":
+        return n * n
+    if encoding == "compact":
+        return n * max(1, int(np.ceil(np.log2(n))))
+    raise ValueError(f"Unknown encoding {encoding!r}; use 'onehot' or 'compact'")
+
+
+def encode(solutions, n, encoding="onehot"):
+    """Basis-state indices (Python ints) of solutions in the given encoding."""
+    num_qubits = qubits(n, encoding)
+    indices = []
+    for s in np.asarray(solutions).reshape(-1, n):
+        if encoding == "onehot":
+            wires = np.arange(n) * n + s
+            indices.append(sum(1 << (num_qubits - 1 - int(w)) for w in wires))
+        else:
+            b = num_qubits // n
+            value = 0
+            for c in s:
+                value = (value << b) | int(c)
+            indices.append(value)
+    return indices
+
+
+def decode(index, n, encoding="onehot"):
+    """(n, n) 0/1 board of a basis-state index, or None if a compact row holds a column >= n."""
+    num_qubits = qubits(n, encoding)
+    bits = [int(ch) for ch in format(int(index), f"0{num_qubits}b")]
+    if encoding == "onehot":
+        return np.array(bits, dtype=int).reshape(n, n)
+    b = num_qubits // n
+    columns = [int("".join(map(str, bits[r * b:(r + 1) * b])), 2) for r in range(n)]
+    if max(columns) >= n:
+        return None
+    board = np.zeros((n, n), dtype=int)
+    board[np.arange(n), columns] = 1
+    return board
+
+
+def is_solution(board):
+    """True if the 0/1 board has n non-attacking queens."""
+    if board is None:
+        return False
+    board = np.asarray(board)
+    n = len(board)
+    r, c = np.nonzero(board)
+    return (len(r) == n and len(set(r)) == n and len(set(c)) == n
+            and len(set(r + c)) == n and len(set(r - c)) == n)
+
+
+def optimal_iterations(num_qubits, num_marked):
+    """floor(pi / (4 theta)) with sin(theta) = sqrt(M / N)."""
+    if num_marked == 0:
+        return 0
+    theta = np.arcsin(np.sqrt(num_marked / 2.0 ** num_qubits))
+    return int(np.floor(np.pi / (4 * theta)))
+
+
+class GroverNQueens:
+    """Grover search for N-Queens with a precomputed diagonal phase oracle."""
+
+    def __init__(self, n, encoding="onehot", solutions=None):
+        self.n = n
+        self.encoding = encoding
+        self.num_qubits = qubits(n, encoding)
+        self.solutions = solve_all(n) if solutions is None else np.asarray(solutions)
+        self.marked = sorted(encode(self.solutions, n, encoding))
+        self.iterations = optimal_iterations(self.num_qubits, len(self.marked))
+
+    def phase_mask(self):
+        """The oracle as a dense int8 vector of +1 / -1 over all 2^num_qubits basis states."""
+        if self.num_qubits > DENSE_MAX_QUBITS:
+            raise MemoryError(f"{self.num_qubits} qubits is too large for a dense phase mask")
+        mask = np.ones(2 ** self.num_qubits, dtype=np.int8)
+        mask[np.array(self.marked, dtype=np.int64)] = -1
+        return mask
+
+    def statevector(self, iterations=None):
+        """Dense simulation: element-wise phase mask, then reflection about the mean."""
+        iterations = self.iterations if iterations is None else iterations
+        mask = self.phase_mask()
+        psi = np.full(len(mask), 2 ** (-self.num_qubits / 2))
+        for _ in range(iterations):
+            psi *= mask
+            mean = psi.mean()
+            psi *= -1
+            psi += 2 * mean
+        return psi
+
+    def run(self, iterations=None):
+        """Exact (unmarked amplitude, marked amplitudes) after the iterations, for any register size.
+
+        From the uniform start all marked states share one amplitude, so after
+        k iterations they hold sin((2k + 1) theta) / sqrt(M) and every other
+        state cos((2k + 1) theta) / sqrt(N - M); O(M) however large k is.
+        """
+        iterations = self.iterations if iterations is None else iterations
+        size, m = 2.0 ** self.num_qubits, len(self.marked)
+        if m == 0:
+            return size ** -0.5, np.zeros(0)
+        theta = np.arcsin(np.sqrt(m / size))
+        angle = (2 * iterations + 1) * theta
+        u = np.cos(angle) / np.sqrt(size - m) if size > m else 0.0
+        return u, np.full(m, np.sin(angle) / np.sqrt(m))
+
+    def success_probability(self, iterations=None):
+        return min(1.0, float((self.run(iterations)[1] ** 2).sum()))
+
+    def sample(self, shots=1024, iterations=None, seed=None):
+        """{index: count} of measured basis states (indices are Python ints)."""
+        rng = np.random.default_rng(seed)
+        _, amplitudes = self.run(iterations)
+        p = amplitudes ** 2
+        hits = rng.binomial(shots, min(1.0, p.sum())) if len(p) else 0
+        counts = {}
+        if hits:
+            for k, c in zip(*np.unique(rng.choice(len(p), size=hits, p=p / p.sum()), return_counts=True)):
+                counts[self.marked[k]] = int(c)
+        marked = set(self.marked)
+        nbytes = (self.num_qubits + 7) // 8
+        for _ in range(shots - hits):
+            # Unmarked states are equally likely: uniform draw, redrawn if it hits a solution
+            while True:
+                x = int.from_bytes(rng.bytes(nbytes), "big") >> (8 * nbytes - self.num_qubits)
+                if x not in marked:
+                    break
+            counts[x] = counts.get(x, 0) + 1
+        return counts
+
+    def most_likely_board(self, shots=1024, seed=None):
+        counts = self.sample(shots, seed=seed)
+        return decode(max(counts, key=counts.get), self.n, self.encoding)
+
+
+def benchmark(sizes=range(4, 13), shots=1024, seed=0):
+    """Enumeration time, register sizes and Grover success probability for each n."""
+    print(f"{'n':>3} {'solutions':>10} {'fundamental':>12} {'enum [ms]':>10} {'onehot q':>9} "
+          f"{'compact q':>10} {'iters':>8} {'P(success)':>11} {'grover [ms]':>12} {'valid':>6}")
+    for n in sizes:
+        start = time.perf_counter()
+        solutions = solve_all(n)
+        enum_time = time.perf_counter() - start
+        assert len(solutions) == count_solutions(n)
+        fundamental = len(fundamental_solutions(n)) if n <= 10 else float("nan")
+        start = time.perf_counter()
+        grover = GroverNQueens(n, "compact", solutions)
+        board = grover.most_likely_board(shots, seed=seed)
+        grover_time = time.perf_counter() - start
+        print(f"{n:3d} {len(solutions):10d} {fundamental:12} {1e3 * enum_time:10.2f} {qubits(n):9d} "
+              f"{grover.num_qubits:10d} {grover.iterations:8d} {grover.success_probability():11.4f} "
+              f"{1e3 * grover_time:12.2f} {str(is_solution(board)):>6}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Classical and Grover N-Queens engine.")
+    parser.add_argument("--min-n", type=int, default=4)
+    parser.add_argument("--max-n", type=int, default=12)
+    parser.add_argument("--shots", type=int, default=1024)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    benchmark(range(args.min_n, args.max_n + 1), args.shots, args.seed)
+
+
+if __name__ == "__main__":
+    main()
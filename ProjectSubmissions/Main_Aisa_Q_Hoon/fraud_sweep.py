@@ -0,0 +1,170 @@
+import argparse
+import csv
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+from scipy.stats import binom
+
+from qds_engine import BASES, SIGNATURE_ANGLE
+
+# Sweeps over attacker rotation angles, shot counts, numbers of verifiers and
+# acceptance thresholds for the single-qubit QDS scheme in quanta.py.
+#
+# A party measuring the state RY(SIGNATURE_ANGLE + forgery) |0> after undoing
+# its basis rotation RY(-basis) sees '0' with probability
+#     p0 = cos^2((SIGNATURE_ANGLE + forgery - basis) / 2)
+# and accepts if at least ceil(threshold * shots) of its shots give '0'.
+# Each verifier picks its basis uniformly from BASES. A signature is accepted
+# only if every verifier accepts, so a forgery is detected if any one rejects.
+
+FIELDS = ["forgery_angle", "shots", "verifiers", "threshold",
+          "honest_accept", "attack_detect", "honest_accept_sampled", "attack_detect_sampled"]
+TABLE_DTYPE = [(name, int if name in ("shots", "verifiers") else float) for name in FIELDS]
+
+
+def zero_probability(forgery_angle, basis):
+    """Probability of measuring '0' for a given forgery angle and measurement basis."""
+    return np.cos((SIGNATURE_ANGLE + np.asarray(forgery_angle) - np.asarray(basis)) / 2) ** 2
+
+
+def min_zeros(shots, thresholds):
+    """Smallest number of '0' outcomes that meets each threshold."""
+    return np.ceil(np.asarray(thresholds) * shots - 1e-9).astype(int)
+
+
+def single_acceptance(forgery_angle, shots, thresholds):
+    """Probability that one verifier (random basis) accepts, for each threshold."""
+    k = min_zeros(shots, thresholds)
+    p0 = zero_probability(forgery_angle, np.array(BASES))
+    # P(zeros >= k) = sf(k - 1), averaged over the two bases
+    return binom.sf(k[:, None] - 1, shots, p0[None, :]).mean(axis=1)
+
+
+def analytic_rates(forgery_angle, shots, verifiers, thresholds):
+    """Analytic (honest_accept, attack_detect) arrays of shape (len(verifiers), len(thresholds))."""
+    v = np.asarray(verifiers)[:, None]
+    honest = single_acceptance(0.0, shots, thresholds)[None, :] ** v
+    attack = single_acceptance(forgery_angle, shots, thresholds)[None, :] ** v
+    return honest, 1.0 - attack
+
+
+def sampled_rates(forgery_angle, shots, verifiers, thresholds, trials, rng):
+    """Monte Carlo estimate of the same rates using vectorised binomial draws."""
+    k = min_zeros(shots, thresholds)
+    max_v = int(np.max(verifiers))
+    rates = []
+    for angle in (0.0, forgery_angle):
+        bases = rng.choice(BASES, size=(trials, max_v))
+        zeros = rng.binomial(shots, zero_probability(angle, bases))
+        # Accepted by the first v verifiers <=> the minimum of their zero counts meets k
+        running_min = np.minimum.accumulate(zeros, axis=1)
+        mins = running_min[:, np.asarray(verifiers) - 1]                 # (trials, V)
+        accepted = mins[:, :, None] >= k[None, None, :]                  # (trials, V, thresholds)
+        rates.append(accepted.mean(axis=0))
+    honest, attack = rates
+    return honest, 1.0 - attack
+
+
+def evaluate_point(args):
+    """Evaluates one (forgery_angle, shots) grid point for all verifier counts and thresholds.
+
+    Returns a structured array block with one row per (verifiers, threshold) pair.
+    """
+    forgery_angle, shots, verifiers, thresholds, trials, seed = args
+    honest, detect = analytic_rates(forgery_angle, shots, verifiers, thresholds)
+    if trials > 0:
+        rng = np.random.default_rng(seed)
+        honest_s, detect_s = sampled_rates(forgery_angle, shots, verifiers, thresholds, trials, rng)
+    else:
+        honest_s = detect_s = np.full(honest.shape, np.nan)
+
+    block = np.empty(honest.size, dtype=TABLE_DTYPE)
+    block["forgery_angle"] = forgery_angle
+    block["shots"] = shots
+    block["verifiers"] = np.repeat(verifiers, len(thresholds))
+    block["threshold"] = np.tile(thresholds, len(verifiers))
+    block["honest_accept"] = honest.ravel()
+    block["attack_detect"] = detect.ravel()
+    block["honest_accept_sampled"] = honest_s.ravel()
+    block["attack_detect_sampled"] = detect_s.ravel()
+    return block
+
+
+def sweep(forgery_angles, shot_counts, verifiers, thresholds, trials=0, workers=None, seed=0):
+    """Runs the full grid, one process-pool task per (forgery_angle, shots) pair.
+
+    Returns a structured NumPy array with the columns in FIELDS.
+    """
+    verifiers = [int(v) for v in verifiers]
+    thresholds = [float(t) for t in thresholds]
+    seeds = np.random.SeedSequence(seed).spawn(len(forgery_angles) * len(shot_counts))
+    tasks = [(float(a), int(s), verifiers, thresholds, trials, child)
+             for (a, s), child in zip(product(forgery_angles, shot_counts), seeds)]
+
+    if workers == 1:
+        blocks = list(map(evaluate_point, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            blocks = list(pool.map(evaluate_point, tasks, chunksize=max(1, len(tasks) // 64)))
+    return np.concatenate(blocks)
+
+
+def print_roc_table(table, forgery_angle=None, shots=None, verifiers=None):
+    """Prints an ROC-style table (honest acceptance vs attack detection per threshold)."""
+    mask = np.ones(len(table), dtype=bool)
+    if forgery_angle is not None:
+        mask &= np.isclose(table["forgery_angle"], forgery_angle)
+    if shots is not None:
+        mask &= table["shots"] == shots
+    if verifiers is not None:
+        mask &= table["verifiers"] == verifiers
+
+    print(f"{'forgery':>8} {'shots':>6} {'verif':>6} {'thresh':>7} "
+          f"{'honest acc':>11} {'detect':>8} {'honest~':>8} {'detect~':>8}")
+    for row in table[mask]:
+        print(f"{row['forgery_angle']:8.3f} {row['shots']:6d} {row['verifiers']:6d} {row['threshold']:7.3f} "
+              f"{row['honest_accept']:11.4f} {row['attack_detect']:8.4f} "
+              f"{row['honest_accept_sampled']:8.4f} {row['attack_detect_sampled']:8.4f}")
+
+
+def write_csv(table, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        writer.writerows(table.tolist())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fraud-detection sweep for the single-qubit QDS scheme.")
+    parser.add_argument("--angles", type=float, nargs=3, default=[0.0, np.pi, 13],
+                        metavar=("START", "STOP", "NUM"), help="Attacker rotation angles (linspace)")
+    parser.add_argument("--shots", type=int, nargs="+", default=[8, 16, 32, 64, 128])
+    parser.add_argument("--verifiers", type=int, nargs="+", default=[1, 3, 10, 100])
+    parser.add_argument("--thresholds", type=float, nargs="+",
+                        default=list(np.round(np.linspace(0.5, 1.0, 11), 3)))
+    parser.add_argument("--trials", type=int, default=0,
+                        help="Monte Carlo trials per grid point (0 = analytic only)")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", help="Write the full table to this CSV file")
+    args = parser.parse_args(argv)
+
+    angles = np.linspace(args.angles[0], args.angles[1], int(args.angles[2]))
+    start = time.perf_counter()
+    table = sweep(angles, args.shots, args.verifiers, args.thresholds,
+                  trials=args.trials, workers=args.workers, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"Evaluated {len(table)} configurations in {elapsed:.2f} s", file=sys.stderr)
+
+    if args.csv:
+        write_csv(table, args.csv)
+    else:
+        print_roc_table(table, forgery_angle=np.pi / 3 if np.isclose(angles, np.pi / 3).any() else angles[-1],
+                        shots=args.shots[0])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+from collections import namedtuple
+
+import numpy as np
+from qiskit import QuantumCircuit, transpile
+from qiskit.circuit import Parameter
+from qiskit.quantum_info import Statevector
+from qiskit_aer import AerSimulator
+from scipy.stats import binom
+
+# Angle of the RY rotation that creates the signature state
+SIGNATURE_ANGLE = np.pi / 4
+# The two measurement bases a verifier can pick (0° and 45°)
+BASES = (0.0, np.pi / 4)
+# Largest chance of rejecting an honest party when no fixed threshold is given
+FALSE_REJECTION = 0.01
+
+# A party checking the signature. Attackers tamper with the state by applying
+# an extra RY(forgery_angle) before it is measured; honest verifiers use 0.
+Party = namedtuple("Party", ["name", "basis", "forgery_angle"], defaults=[0.0])
+
+
+def random_parties(num_verifiers, num_attackers=0, forgery_angle=np.pi / 3, rng=None):
+    """Verifiers (and attackers) with randomly chosen 0° / 45° measurement bases."""
+    rng = np.random.default_rng(rng)
+    bases = rng.choice(BASES, size=num_verifiers + num_attackers)
+    parties = [Party(f"Verifier {i + 1}", bases[i]) for i in range(num_verifiers)]
+    parties += [Party(f"Attacker {i + 1}", bases[num_verifiers + i], forgery_angle)
+                for i in range(num_attackers)]
+    return parties
+
+
+class QDSVerificationEngine:
+    """Verifies the single-qubit signature state for many parties in one simulator job.
+
+    The signature circuit is never modified. A single parametrised measurement
+    template (signature -> RY(forgery) -> RY(-basis) -> measure) is transpiled
+    once per engine, and each party gets a bound copy of it. All bound circuits
+    are submitted together as one multi-circuit job.
+
+    The scheme in quanta.py fixes no acceptance rule. By default a party is
+    accepted if its '0' count is one an honest party measuring in the same
+    basis reaches with probability at least 1 - false_rejection (a quantile of
+    Binomial(shots, p0), p0 computed exactly from the signature circuit).
+    A ``threshold`` fraction of shots replaces this with a fixed cut-off.
+    """
+
+    def __init__(self, signature_qc=None, shots=16, threshold=None, backend=None,
+                 false_rejection=FALSE_REJECTION):
+        if signature_qc is None:
+            signature_qc = QuantumCircuit(1, 1)
+            signature_qc.ry(SIGNATURE_ANGLE, 0)
+        self.signature_qc = signature_qc
+        self.shots = shots
+        self.threshold = threshold
+        self.false_rejection = false_rejection
+        self.backend = backend or AerSimulator()
+
+        self._forgery = Parameter("forgery")
+        self._basis = Parameter("basis")
+        self._ideal = signature_qc.copy()
+        self._ideal.ry(self._forgery, 0)
+        self._ideal.ry(-self._basis, 0)
+        template = self._ideal.copy()
+        template.measure(0, 0)
+        self._template = transpile(template, self.backend)
+
+    def measurement_variant(self, basis, forgery_angle=0.0):
+        """Transpiled measurement circuit for one party (a new circuit, never the original)."""
+        return self._template.assign_parameters(
+            {self._forgery: float(forgery_angle), self._basis: float(basis)})
+
+    def honest_zero_probability(self, basis):
+        """Exact probability that an untampered signature measured in ``basis`` gives '0'."""
+        qc = self._ideal.assign_parameters({self._forgery: 0.0, self._basis: float(basis)})
+        return float(Statevector(qc).probabilities([0])[0])
+
+    def min_zeros(self, bases):
+        """Fewest '0' outcomes each party needs to be accepted, for an array of bases."""
+        if self.threshold is not None:
+            return np.full(len(bases), int(np.ceil(self.threshold * self.shots - 1e-9)))
+        p0 = {b: self.honest_zero_probability(b) for b in set(bases.tolist())}
+        return np.array([binom.ppf(self.false_rejection, self.shots, min(p0[b], 1.0)) for b in bases],
+                        dtype=int)
+
+    def run(self, parties, plot=False):
+        """Runs every party's check as one job and returns acceptance statistics as arrays.
+
+        Returns a dict with ``names``, ``bases``, ``forgery_angles``, ``zeros``
+        (count of '0' outcomes), ``success_rate``, ``min_zeros`` and
+        ``accepted`` (zeros >= min_zeros), each indexed like ``parties``.
+        An empty ``parties`` list gives empty arrays without running a job.
+        """
+        parties = [p if isinstance(p, Party) else Party(*p) for p in parties]
+        bases = np.array([p.basis for p in parties], dtype=float)
+        forgery_angles = np.array([p.forgery_angle for p in parties], dtype=float)
+        circuits = [self.measurement_variant(b, f) for b, f in zip(bases, forgery_angles)]
+
+        if circuits:
+            result = self.backend.run(circuits, shots=self.shots).result()
+            zeros = np.array([result.get_counts(i).get("0", 0) for i in range(len(circuits))])
+        else:
+            zeros = np.zeros(0, dtype=int)
+        success_rate = zeros / self.shots
+        min_zeros = self.min_zeros(bases)
+
+        stats = {
+            "names": [p.name for p in parties],
+            "bases": bases,
+            "forgery_angles": forgery_angles,
+            "zeros": zeros,
+            "success_rate": success_rate,
+            "min_zeros": min_zeros,
+            "accepted": zeros >= min_zeros,
+        }
+        if plot:
+            plot_statistics(stats)
+        return stats
+
+
+def plot_statistics(stats):
+    """Bar chart of each party's success rate (only called when plotting is requested)."""
+    import matplotlib.pyplot as plt
+
+    colors = ["tab:green" if ok else "tab:red" for ok in stats["accepted"]]
+    plt.figure(figsize=(max(6, len(stats["names"]) * 0.4), 4))
+    plt.bar(range(len(stats["names"])), stats["success_rate"], color=colors)
+    plt.xticks(range(len(stats["names"])), stats["names"], rotation=90)
+    plt.ylabel("Success rate")
+    plt.ylim(0, 1)
+    plt.title("QDS verification")
+    plt.tight_layout()
+    plt.show()
+
+
+def verify_parties(parties, signature_qc=None, shots=16, threshold=None, plot=False):
+    """Convenience wrapper: build an engine and verify ``parties`` in one job."""
+    return QDSVerificationEngine(signature_qc, shots, threshold).run(parties, plot=plot)
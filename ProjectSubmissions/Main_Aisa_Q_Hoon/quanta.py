@@ -4,24 +4,28 @@ from qiskit_aer import AerSimulator
 import numpy as np  
 import random  
 
+from qds_engine import Party, QDSVerificationEngine
+
 # Darshan setting up the quantum signature  
-def create_qds_state():
+def create_qds_state(plot=False):
     qc = QuantumCircuit(1, 1)  
     qc.ry(np.pi / 4, 0)  
     print("Signature State Created")
-    qc.draw('mpl')  # Use 'mpl' to draw using Matplotlib
-    try:
-        plt.show()  # Ensure the plot is displayed
-    except Exception as e:
-        print(f"Error displaying plot: {e}")
+    if plot:
+        qc.draw('mpl')  # Use 'mpl' to draw using Matplotlib
+        try:
+            plt.show()  # Ensure the plot is displayed
+        except Exception as e:
+            print(f"Error displaying plot: {e}")
     return qc  
 
 # Verifiers checking if signature is legit  
-def verify_qds(qc, verifier_name):
+def verify_qds(qc, verifier_name, plot=False):
     backend = AerSimulator()  
     basis_choice = random.choice([0, np.pi/4])  
     print(f"{verifier_name} measuring in {'0°' if basis_choice == 0 else '45°'} basis")  
 
+    qc = qc.copy()  # Measure a copy so the caller's circuit is left untouched
     if basis_choice == np.pi/4:
         qc.ry(-np.pi/4, 0)  
 
@@ -32,27 +36,24 @@ def verify_qds(qc, verifier_name):
 
     print(f"{verifier_name} got: {counts}")  
     print(f"{verifier_name} success rate: {counts.get('0', 0) / 16:.2f}\n")  
-    qc.draw('mpl')  # Draw the quantum circuit after the verification
-    plt.show()  # Ensure the plot is displayed
-
-# Darshan sending the quantum signature  
-print("Darshan creating a quantum signature...")  
-signature_qc = create_qds_state()  
-
-# The boys checking the signature  
-verifiers = {  
-    "Puneet": signature_qc.copy(),  
-    "Kiccha": signature_qc.copy(),  
-    "Sudeep": signature_qc.copy()  
-}  
-
-for name, qc in verifiers.items():  
-    print(f"{name} verifying...")  
-    verify_qds(qc, name)  
-
-# Huccha Venkat trying to pull scene 
-fake_qc = signature_qc.copy()  
-fake_qc.ry(np.pi / 3, 0)  
-
-print("Huccha Venkat attempting fraud...")  
-verify_qds(fake_qc, "Huccha Venkat (Attacker)")  
+    if plot:
+        qc.draw('mpl')  # Draw the quantum circuit after the verification
+        plt.show()  # Ensure the plot is displayed
+
+if __name__ == "__main__":
+    # Darshan sending the quantum signature
+    print("Darshan creating a quantum signature...")
+    signature_qc = create_qds_state()
+
+    # The boys checking the signature, plus Huccha Venkat trying to pull scene with an extra RY(pi/3)
+    parties = [Party(name, random.choice([0, np.pi/4])) for name in ["Puneet", "Kiccha", "Sudeep"]]
+    parties.append(Party("Huccha Venkat (Attacker)", random.choice([0, np.pi/4]), np.pi / 3))
+
+    # All checks run as a single simulator job
+    engine = QDSVerificationEngine(signature_qc, shots=16)
+    stats = engine.run(parties)
+
+    for name, basis, zeros, rate, ok in zip(stats["names"], stats["bases"], stats["zeros"],
+                                           stats["success_rate"], stats["accepted"]):
+        print(f"{name} measuring in {'0°' if basis == 0 else '45°'} basis")
+        print(f"{name} got {zeros}/16 zeros, success rate: {rate:.2f} -> {'accepted' if ok else 'rejected'}\n")
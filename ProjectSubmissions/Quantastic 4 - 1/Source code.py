@@ -3,18 +3,45 @@ import random
 import time
 
 # Qiskit imports
-from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, transpile
 from qiskit_aer import Aer
 
+from candidate_masks import BIT, MASK_VALUES, CandidateGrid, QuantumStates, find_conflicts, is_solved
+from puzzle_generator import REMOVE_COUNTS, count_solutions
+from quantum_measurement import aer_counts, measurement_circuit, outcome_probabilities, sample_counts
+from trail_search import TrailSearch
+
 class QuantumSudoku:
+    # Measurements sample the exact, cached outcome distribution of each circuit;
+    # set use_aer = True to run every measurement on the Aer simulator instead
+    use_aer = False
+    
     def __init__(self, difficulty='medium'):
         # Initialize empty 9x9 board
         self.board = np.zeros((9, 9), dtype=int)
         self.original = np.zeros((9, 9), dtype=int)
-        self.quantum_states = {}  # Stores cells in superposition
+        self.grid = CandidateGrid(self.board)  # Unit masks and candidates of the cells in superposition
         self.difficulty = difficulty
         self.initialize_game()
         self.simulator = Aer.get_backend('qasm_simulator')
+
+    @property
+    def quantum_states(self):
+        """Cells in superposition as {(row, col): [possible values]}, read from the candidate masks"""
+        return QuantumStates(self.grid)
+
+    @quantum_states.setter
+    def quantum_states(self, states):
+        # Replacing the whole dict (e.g. restoring a backup) also resyncs the masks with the board
+        self.refresh_candidates()
+        self.grid.open[:] = False
+        self.grid.cand[:] = 0
+        view = self.quantum_states
+        for pos, values in states.items():
+            view[pos] = values
+
+    def refresh_candidates(self):
+        """Rebuild the row/column/box masks after the board was edited directly"""
+        self.grid.load(self.board)
     
     def initialize_game(self):
         # First generate a solved board
@@ -23,63 +50,23 @@ class QuantumSudoku:
         self.create_puzzle()
         # Copy to original to track which cells were given initially
         self.original = self.board.copy()
-        # Initialize quantum states for empty cells
-        for i in range(9):
-            for j in range(9):
-                if self.board[i][j] == 0:
-                    # Empty cells start in superposition of all possible values
-                    valid_values = self.find_possible_values(i, j)
-                    self.quantum_states[(i, j)] = valid_values
+        # Initialize quantum states for empty cells:
+        # empty cells start in superposition of all possible values
+        self.grid.open_empty_cells()
     
     def generate_solved_board(self):
         """Generate a fully solved Sudoku board using backtracking"""
         # Start with an empty board
         self.board = np.zeros((9, 9), dtype=int)
-        # Fill the board
-        self._solve_board()
-    
-    def _solve_board(self, i=0, j=0):
-        """Helper method to recursively solve the board"""
-        # If we've filled the entire board, we're done
-        if i == 9:
-            return True
-        
-        # Calculate next position
-        next_i, next_j = (i, j + 1) if j < 8 else (i + 1, 0)
-        
-        # If the current cell is already filled, move to the next cell
-        if self.board[i][j] != 0:
-            return self._solve_board(next_i, next_j)
-        
-        # Try values 1-9 in a random order
-        numbers = list(range(1, 10))
-        random.shuffle(numbers)
-        
-        for num in numbers:
-            if self.is_valid_move(i, j, num):
-                self.board[i][j] = num
-                
-                # Recursively try to solve the rest of the board
-                if self._solve_board(next_i, next_j):
-                    return True
-                
-                # If we get here, we need to backtrack
-                self.board[i][j] = 0
-        
-        # No solution found for this configuration
-        return False
+        self.grid.load(self.board)
+        self.grid.open_empty_cells()
+        # Fill the board: MRV trail search trying values in a random order
+        TrailSearch(self.grid, rng=random).run(limit=1)
     
     def create_puzzle(self):
         """Remove numbers from the solved board to create a puzzle"""
         # Number of cells to remove based on difficulty
-        cells_to_remove = {
-            'easy': 30,
-            'medium': 45,
-            'hard': 55,
-            'quantum': 60
-        }
-        
-        remove_count = cells_to_remove.get(self.difficulty, 45)
+        remove_count = REMOVE_COUNTS.get(self.difficulty, 45)
         
         # Make a list of all positions on the board
         positions = [(i, j) for i in range(9) for j in range(9)]
@@ -89,41 +76,28 @@ class QuantumSudoku:
         for pos in positions[:remove_count]:
             i, j = pos
             temp = self.board[i][j]
-            self.board[i][j] = 0
+            self.grid.clear_value(i * 9 + j)
             
             # For harder difficulties, we don't check for uniqueness
             # This makes the puzzles harder as they might have multiple solutions
             if self.difficulty in ['easy', 'medium']:
                 # If we're making it too hard (multiple solutions), undo the removal
                 if not self.has_unique_solution():
-                    self.board[i][j] = temp
+                    self.grid.set_value(i * 9 + j, temp)
     
     def has_unique_solution(self):
         """Check if the current board has a unique solution"""
-        # This is a simplified check - for real Sudoku, this would be more complex
-        # For our purposes, we'll assume it's fine
-        return True
+        # Exact bitmask search that stops as soon as a second solution is found
+        return count_solutions(self.board, limit=2) == 1
     
     def is_valid_move(self, row, col, num):
         """Check if placing num at board[row][col] is valid"""
-        # Check row
-        if num in self.board[row, :]:
-            return False
-        
-        # Check column
-        if num in self.board[:, col]:
-            return False
-        
-        # Check 3x3 square
-        square_row, square_col = 3 * (row // 3), 3 * (col // 3)
-        if num in self.board[square_row:square_row+3, square_col:square_col+3]:
-            return False
-        
-        return True
+        # One test against the row, column and 3x3 square masks
+        return bool(self.grid.allows(row * 9 + col, num))
     
     def find_possible_values(self, row, col):
         """Find all possible values for a cell"""
-        return [num for num in range(1, 10) if self.is_valid_move(row, col, num)]
+        return list(MASK_VALUES[self.grid.free_mask(row * 9 + col)])
     
     def create_quantum_circuit(self, possible_values):
         """Create a quantum circuit based on possible values"""
@@ -132,28 +106,16 @@ class QuantumSudoku:
         if n_qubits == 0:
             return None, None
         
-        # If we have more than 9 possible values, something is wrong
-        if n_qubits > 9:
-            n_qubits = 9
-        
-        # Create a circuit with n_qubits
-        qr = QuantumRegister(n_qubits, 'q')
-        cr = ClassicalRegister(n_qubits, 'c')
-        circuit = QuantumCircuit(qr, cr)
-        
-        # Put all qubits in superposition
-        circuit.h(qr)
-        
-        # Entangle qubits to enforce Sudoku constraints
-        # This is a simplified version; a real implementation would 
-        # use more complex gates to enforce all Sudoku rules
-        for i in range(n_qubits - 1):
-            circuit.cx(qr[i], qr[i+1])
-        
-        # Measure all qubits
-        circuit.measure(qr, cr)
-        
-        return circuit, possible_values
+        # The circuit (H on every qubit, a CX chain to entangle them, measure all)
+        # only depends on n_qubits (at most 9), so it is built once per process
+        # and shared; copy it before modifying it
+        return measurement_circuit(n_qubits), possible_values
+    
+    def measurement_counts(self, circuit, shots=1024):
+        """Counts of measuring a cell circuit: sampled from its cached exact distribution, or run on Aer"""
+        if self.use_aer:
+            return aer_counts(circuit.num_qubits, self.simulator, shots)
+        return sample_counts(circuit.num_qubits, shots)
     
     def quantum_measure(self, row, col):
         """Measure a quantum cell using a real quantum circuit"""
@@ -173,13 +135,10 @@ class QuantumSudoku:
         if circuit is None:
             return 0
         
-        # Execute the circuit on a simulator
-        compiled_circuit = transpile(circuit, self.simulator)
-        job = self.simulator.run(compiled_circuit, shots=1024)
-        result = job.result()
+        # Measure the circuit (1024 shots)
+        counts = self.measurement_counts(circuit)
         
-        # Get the counts and determine the most frequent outcome
-        counts = result.get_counts(circuit)
+        # Determine the most frequent outcome
         max_count = 0
         max_bitstring = None
         
@@ -203,45 +162,27 @@ class QuantumSudoku:
         else:
             chosen_value = random.choice(values)
         
-        # Update the board and remove from quantum states
-        self.board[row][col] = chosen_value
-        del self.quantum_states[(row, col)]
-        
-        # Update quantum states of affected cells
-        self.update_affected_cells(row, col, chosen_value)
+        # Update the board, remove from quantum states and
+        # update quantum states of affected cells
+        self.grid.place(row * 9 + col, chosen_value)
         
         return chosen_value
     
     def update_affected_cells(self, row, col, value):
         """Update the quantum states of cells affected by this measurement"""
-        # For each cell in the same row, column, or 3x3 square, remove the measured value
-        # from their possible values if they're in a quantum state
-        for i in range(9):
-            # Same row
-            if i != col and (row, i) in self.quantum_states and value in self.quantum_states[(row, i)]:
-                self.quantum_states[(row, i)].remove(value)
-            
-            # Same column
-            if i != row and (i, col) in self.quantum_states and value in self.quantum_states[(i, col)]:
-                self.quantum_states[(i, col)].remove(value)
-        
-        # Same 3x3 square
-        square_row, square_col = 3 * (row // 3), 3 * (col // 3)
-        for i in range(square_row, square_row + 3):
-            for j in range(square_col, square_col + 3):
-                if (i != row or j != col) and (i, j) in self.quantum_states and value in self.quantum_states[(i, j)]:
-                    self.quantum_states[(i, j)].remove(value)
+        # Clear the value's bit in the candidate masks of the 20 cells sharing
+        # a row, column or 3x3 square with this one
+        self.grid.eliminate(row * 9 + col, value)
     
     def make_move(self, row, col, value):
         """Make a regular move (not quantum)"""
         if self.original[row][col] != 0:
             return False, "Cannot modify original puzzle cells"
         
-        if (row, col) in self.quantum_states:
-            if value in self.quantum_states[(row, col)]:
-                self.board[row][col] = value
-                del self.quantum_states[(row, col)]
-                self.update_affected_cells(row, col, value)
+        cell = row * 9 + col
+        if self.grid.open[cell]:
+            if 1 <= value <= 9 and self.grid.cand[cell] & BIT[value]:
+                self.grid.place(cell, value)
                 return True, "Move successful"
             else:
                 return False, "Invalid move - value not in quantum state"
@@ -264,11 +205,12 @@ class QuantumSudoku:
         if circuit is None:
             return {val: 1/len(possible_values) for val in possible_values}
         
-        # Execute the circuit
-        compiled_circuit = transpile(circuit, self.simulator)
-        job = self.simulator.run(compiled_circuit, shots=1024)
-        result = job.result()
-        counts = result.get_counts(circuit)
+        # Outcome distribution of the circuit: exact from the cached statevector
+        # probabilities, or estimated from 1024 Aer shots
+        if self.use_aer:
+            counts = self.measurement_counts(circuit)
+        else:
+            counts = outcome_probabilities(circuit.num_qubits)
         
         # Calculate probabilities for each value
         probabilities = {}
@@ -299,26 +241,11 @@ class QuantumSudoku:
     def is_complete(self):
         """Check if the puzzle is complete and correct"""
         # If there are still quantum states, it's not complete
-        if self.quantum_states:
+        if self.grid.open.any():
             return False
         
-        # Check if the board is correctly filled
-        for i in range(9):
-            # Check rows
-            if set(self.board[i, :]) != set(range(1, 10)):
-                return False
-            
-            # Check columns
-            if set(self.board[:, i]) != set(range(1, 10)):
-                return False
-        
-        # Check 3x3 squares
-        for i in range(0, 9, 3):
-            for j in range(0, 9, 3):
-                if set(self.board[i:i+3, j:j+3].flatten()) != set(range(1, 10)):
-                    return False
-        
-        return True
+        # Check that every row, column and 3x3 square holds 1-9
+        return is_solved(self.board)
     
     def display_board(self):
         """Display the current state of the board"""
@@ -360,6 +287,7 @@ class QuantumSudokuSolver:
         self.game = quantum_sudoku_game
         self.board = self.game.board.copy()
         self.quantum_states = self.game.quantum_states.copy()
+        self.stats = {}  # Search statistics of the last backtracking run
     
     def solve(self, use_quantum=True, visualize=False, delay=0.5):
         """
@@ -398,7 +326,8 @@ class QuantumSudokuSolver:
         # Finally, use backtracking for any remaining cells
         print("Using backtracking to solve remaining cells...")
         if self._solve_with_backtracking(0, 0, visualize, delay):
-            print("Puzzle solved with backtracking!")
+            print(f"Puzzle solved with backtracking! ({self.stats['nodes']} nodes, "
+                  f"{self.stats['backtracks']} backtracks)")
             return True
         else:
             print("Failed to solve the puzzle!")
@@ -546,54 +475,36 @@ class QuantumSudokuSolver:
                 if self.game.is_complete():
                     return
     
-    def _solve_with_backtracking(self, row, col, visualize=False, delay=0.5):
-        """Use backtracking to solve the remaining puzzle"""
-        # If we've gone through the entire board, we're done
-        if row == 9:
-            return True
-        
-        # Calculate next position
-        next_row, next_col = (row, col + 1) if col < 8 else (row + 1, 0)
+    def _solve_with_backtracking(self, row=0, col=0, visualize=False, delay=0.5):
+        """Use backtracking to solve the remaining puzzle
         
-        # If this cell is already filled, move to the next cell
-        if self.game.board[row, col] != 0:
-            return self._solve_with_backtracking(next_row, next_col, visualize, delay)
-        
-        # Get the possible values for this cell
-        possible_values = []
-        if (row, col) in self.game.quantum_states:
-            possible_values = self.game.quantum_states[(row, col)].copy()
-        else:
-            possible_values = self.game.find_possible_values(row, col)
+        Iterative search that always fills the cell with the fewest possible
+        values next (MRV) and undoes moves from a trail of changed candidates
+        instead of copying the quantum states. row and col are kept for
+        compatibility; the search order does not depend on them.
+        Node counts are stored in self.stats.
+        """
+        # Any empty cell that is not in superposition yet gets all values it allows
+        for cell in np.flatnonzero((self.game.board.reshape(81) == 0) & ~self.game.grid.open):
+            self.game.grid.open[cell] = True
+            self.game.grid.cand[cell] = self.game.grid.free_mask(cell)
         
-        # Try each possible value
-        for value in possible_values:
-            # Make a copy of the quantum states before this move
-            quantum_states_backup = {k: v.copy() for k, v in self.game.quantum_states.items()}
-            
-            # Try this value
-            success, _ = self.game.make_move(row, col, value)
-            
-            if success:
-                if visualize:
-                    self.game.display_board()
-                    time.sleep(delay)
-                
-                # Recursively solve the rest of the board
-                if self._solve_with_backtracking(next_row, next_col, visualize, delay):
-                    return True
-            
-            # If we get here, we need to backtrack
-            # Restore the board and quantum states
-            self.game.board[row, col] = 0
-            self.game.quantum_states = quantum_states_backup
+        on_place = on_undo = None
+        if visualize:
+            def on_place(cell, value):
+                self.game.display_board()
+                time.sleep(delay)
             
-            if visualize:
+            def on_undo(cell):
                 self.game.display_board()
                 time.sleep(delay/2)  # Shorter delay for backtracking
         
-        # No solution found for this cell
-        return False
+        start = time.perf_counter()
+        search = TrailSearch(self.game.grid, on_place, on_undo)
+        solved = search.run(limit=1) == 1
+        self.stats = {"nodes": search.nodes, "backtracks": search.backtracks,
+                      "time": time.perf_counter() - start}
+        return solved
 
 
 class CustomQuantumSudoku(QuantumSudoku):
@@ -608,7 +519,6 @@ class CustomQuantumSudoku(QuantumSudoku):
         # Initialize empty 9x9 board
         self.board = np.zeros((9, 9), dtype=int)
         self.original = np.zeros((9, 9), dtype=int)
-        self.quantum_states = {}  # Stores cells in superposition
         self.simulator = Aer.get_backend('qasm_simulator')
         
         # Convert input board to numpy array if it's not already
@@ -628,18 +538,15 @@ class CustomQuantumSudoku(QuantumSudoku):
                                 board_array[i, j] = 0
             self.board = board_array
         else:
-            self.board = input_board.copy()
+            self.board = np.array(input_board, dtype=int)
         
         # Copy to original to track which cells were given initially
         self.original = self.board.copy()
         
-        # Initialize quantum states for empty cells
-        for i in range(9):
-            for j in range(9):
-                if self.board[i][j] == 0:
-                    # Empty cells start in superposition of all possible values
-                    valid_values = self.find_possible_values(i, j)
-                    self.quantum_states[(i, j)] = valid_values
+        # Initialize quantum states for empty cells:
+        # empty cells start in superposition of all possible values
+        self.grid = CandidateGrid(self.board)
+        self.grid.open_empty_cells()
 
 def parse_input_board():
     """
@@ -708,20 +615,12 @@ def solve_custom_sudoku(visualize=True, delay=0.3, use_quantum=True):
     print("\nYour input puzzle:")
     game.display_board()
     
-    # Confirm the puzzle is valid
-    valid = True
-    for i in range(9):
-        for j in range(9):
-            if game.board[i, j] != 0:
-                # Temporarily set the cell to 0 to check if its current value is valid
-                val = game.board[i, j]
-                game.board[i, j] = 0
-                if not game.is_valid_move(i, j, val):
-                    valid = False
-                    print(f"Error: Invalid value {val} at position ({i}, {j})")
-                game.board[i, j] = val
-    
-    if not valid:
+    # Confirm the puzzle is valid: no given value repeats in its row, column or square
+    conflicts = find_conflicts(game.board)
+    for i, j, val in conflicts:
+        print(f"Error: Invalid value {val} at position ({i}, {j})")
+    
+    if conflicts:
         print("The input puzzle is invalid. Please try again.")
         return None, False
     
@@ -0,0 +1,184 @@
+import argparse
+import time
+
+import numpy as np
+
+from candidate_masks import UNITS, CandidateGrid
+from trail_search import solve_grid
+
+# Bulk solver: the basic strategies of QuantumSudokuSolver, run on many
+# boards at once.
+#
+# A chunk of B boards is an (B, 81) int8 array (0 for empty). Each round
+# rebuilds the (B, 81, 9) boolean candidate tensor from the placed values:
+#   used[b, u, v]   value v + 1 is placed in unit u           (B, 27, 9)
+#   cand[b, c, v]   cell c is empty and none of its 3 units uses v + 1
+# and places, on every board at once,
+#   naked singles   cells with exactly one candidate        (sum over values)
+#   hidden singles  values with exactly one cell in a unit  (sum over the unit's cells)
+# Boards with an empty cell without candidates, a value that fits nowhere in
+# a unit, or two placements of the same value in one unit are marked
+# unsolvable. Only boards that are still unsolved after a round without
+# progress go to the per-board TrailSearch.
+
+CHUNK_SIZE = 4096
+
+# Unit indices (row, column, box) of every cell, as rows of UNITS
+CELL_UNITS = np.array([[u for u in range(27) if c in UNITS[u]] for c in range(81)])
+
+SOLVED, SEARCHED, UNSOLVABLE, INVALID = "propagation", "search", "unsolvable", "invalid"
+
+
+def _unit_counts(boards):
+    """(B, 27, 9) number of times each value is placed in each unit."""
+    return (boards[:, UNITS, None] == np.arange(1, 10, dtype=boards.dtype)).sum(axis=2)
+
+
+def candidate_tensor(boards, used=None):
+    """(B, 81, 9) candidates of every cell of every board (False for filled cells)."""
+    if used is None:
+        used = _unit_counts(boards) > 0
+    return ~used[:, CELL_UNITS].any(axis=2) & (boards == 0)[:, :, None]
+
+
+def propagate(boards):
+    """Fills naked and hidden singles in place on a (B, 81) int8 array until no board progresses.
+
+    Returns a (B,) bool array of boards found to be unsolvable; the others are
+    either solved or stalled (still holding empty cells).
+    """
+    invalid = np.zeros(len(boards), dtype=bool)
+    active = np.arange(len(boards))
+    while len(active):
+        sub = boards[active]
+        counts = _unit_counts(sub)
+        used = counts > 0
+        cand = candidate_tensor(sub, used)
+        empty = sub == 0
+        ncand = cand.sum(axis=2)
+        in_units = cand[:, UNITS]                                  # (b, 27, 9 cells, 9 values)
+        per_unit = in_units.sum(axis=2)                            # cells of each unit allowing each value
+        bad = ((counts > 1).any(axis=(1, 2))
+               | (empty & (ncand == 0)).any(axis=1)
+               | ((per_unit == 0) & ~used).any(axis=(1, 2)))
+
+        place = cand & (ncand == 1)[:, :, None]                    # naked singles
+        b, u, v = np.nonzero(per_unit == 1)                        # hidden singles
+        cell = UNITS[u, np.argmax(in_units[b, u, :, v], axis=1)]
+        place[b, cell, v] = True
+        # Two different values for one cell is a contradiction as well
+        bad |= (place.sum(axis=2) > 1).any(axis=1)
+
+        progress = place.any(axis=(1, 2)) & ~bad
+        b, c, v = np.nonzero(place & progress[:, None, None])
+        sub[b, c] = v + 1
+        boards[active] = sub
+        invalid[active[bad]] = True
+        active = active[progress]
+    return invalid
+
+
+def solve_batch(boards):
+    """Solves a (B, 81) or (B, 9, 9) array of boards.
+
+    Returns (solutions as a (B, 81) int8 array, (B,) array of the method
+    each board needed: "propagation", "search" or "unsolvable"). Unsolvable
+    boards are returned as far as propagation got them.
+    """
+    solutions = np.asarray(boards, dtype=np.int8).reshape(-1, 81).copy()
+    methods = np.full(len(solutions), SOLVED, dtype=object)
+    for start in range(0, len(solutions), CHUNK_SIZE):
+        chunk = solutions[start:start + CHUNK_SIZE]
+        invalid = propagate(chunk)
+        methods[start:start + CHUNK_SIZE][invalid] = UNSOLVABLE
+        for k in np.flatnonzero(~invalid & (chunk == 0).any(axis=1)):
+            board = chunk[k].astype(int).reshape(9, 9)
+            grid = CandidateGrid(board)
+            grid.open_empty_cells()
+            solved, _ = solve_grid(grid)
+            if solved:
+                chunk[k] = board.reshape(81)
+            methods[start + k] = SEARCHED if solved else UNSOLVABLE
+    return solutions, methods
+
+
+def parse_board(text):
+    """(81,) int8 board from an 81-character string; '0' or '.' for empty cells."""
+    text = text.strip().replace(".", "0")
+    if len(text) != 81 or not text.isdigit():
+        raise ValueError(f"Not an 81-character board: {text!r}")
+    return np.frombuffer(text.encode(), dtype=np.uint8).astype(np.int8) - ord("0")
+
+
+def read_boards(path):
+    """(boards, expected solutions or None, invalid lines) from a puzzle_generator CSV or one board per line.
+
+    Lines without a valid board are skipped and returned as (row, text) pairs,
+    row being their position among the output rows.
+    """
+    boards, expected, invalid = [], [], []
+    with open(path) as f:
+        for line in f:
+            fields = line.strip().split(",")
+            if not fields[0] or fields[0] == "puzzle":
+                continue
+            try:
+                board = parse_board(fields[0])
+            except ValueError:
+                invalid.append((len(boards) + len(invalid), fields[0]))
+                continue
+            boards.append(board)
+            if len(fields) > 1 and len(fields[1]) == 81:
+                try:
+                    expected.append(parse_board(fields[1]))
+                except ValueError:
+                    pass
+    boards = np.array(boards, dtype=np.int8).reshape(-1, 81)
+    if expected and len(expected) == len(boards):
+        return boards, np.array(expected, dtype=np.int8), invalid
+    return boards, None, invalid
+
+
+def write_solutions(path, boards, solutions, methods, invalid=()):
+    """CSV lines puzzle,solution,method; unsolvable boards get an empty solution.
+
+    invalid holds (row, text) pairs from read_boards, written in place with
+    method "invalid".
+    """
+    rows = []
+    for board, solution, method in zip(boards, solutions, methods):
+        solved = "".join(map(str, solution)) if method != UNSOLVABLE else ""
+        rows.append(f"{''.join(map(str, board))},{solved},{method}\n")
+    for row, text in invalid:
+        rows.insert(row, f"{text},,{INVALID}\n")
+    with open(path, "w") as out:
+        out.write("puzzle,solution,method\n")
+        out.writelines(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve a file of Sudoku boards with vectorised propagation.")
+    parser.add_argument("input", help="puzzle_generator CSV, or one 81-character board per line")
+    parser.add_argument("--out", default="solutions.csv")
+    args = parser.parse_args(argv)
+
+    boards, expected, invalid = read_boards(args.input)
+    start = time.perf_counter()
+    solutions, methods = solve_batch(boards)
+    elapsed = time.perf_counter() - start
+    write_solutions(args.out, boards, solutions, methods, invalid)
+
+    print(f"Solved {len(boards)} boards in {elapsed:.3f} s ({len(boards) / max(elapsed, 1e-9):.0f} boards/s)")
+    for method in (SOLVED, SEARCHED, UNSOLVABLE):
+        print(f"  {method:12s} {int((methods == method).sum())}")
+    if invalid:
+        print(f"  {INVALID:12s} {len(invalid)} (lines without an 81-character board)")
+    if expected is not None:
+        solved = methods != UNSOLVABLE
+        matches = int((solutions[solved] == expected[solved]).all(axis=1).sum())
+        print(f"  matching the input's solutions: {matches} / {len(boards)}")
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+from collections.abc import MutableMapping
+
+import numpy as np
+
+# Bitmask candidate engine for QuantumSudoku.
+#
+# Value v is bit v - 1 of a 9-bit mask. The grid keeps
+#   rows[r], cols[c], boxes[b]   masks of the values already placed in each unit
+#   cand[cell]                   (81,) uint16 candidates of every open cell
+#   open[cell]                   cells still in superposition (quantum_states keys)
+# so the values allowed in a cell are ALL & ~(rows | cols | boxes) and a
+# placement is three ORs plus clearing one bit in the 20 peers of the cell.
+# Cells are numbered row * 9 + col; `board` is the game's own 9x9 array,
+# written through a flat view.
+
+ALL = 0x1FF
+BIT = np.array([0] + [1 << (v - 1) for v in range(1, 10)], dtype=np.uint16)
+POPCOUNT = np.array([bin(m).count("1") for m in range(512)], dtype=np.int8)
+MASK_VALUES = [tuple(v for v in range(1, 10) if m >> (v - 1) & 1) for m in range(512)]
+
+CELLS = np.arange(81)
+ROW = CELLS // 9
+COL = CELLS % 9
+BOX = (ROW // 3) * 3 + COL // 3
+UNITS = np.array([np.flatnonzero(ROW == k) for k in range(9)]
+                 + [np.flatnonzero(COL == k) for k in range(9)]
+                 + [np.flatnonzero(BOX == k) for k in range(9)])
+PEERS = np.array([np.flatnonzero(((ROW == ROW[c]) | (COL == COL[c]) | (BOX == BOX[c])) & (CELLS != c))
+                  for c in CELLS])
+
+
+def values_mask(values):
+    """9-bit mask of an iterable of values 1..9."""
+    mask = 0
+    for v in values:
+        mask |= 1 << (int(v) - 1)
+    return mask
+
+
+def unit_masks(board):
+    """(rows, cols, boxes) masks of the values placed on a 9x9 (or flat 81) board."""
+    bits = BIT[np.asarray(board).reshape(81)]
+    rows = np.bitwise_or.reduce(bits.reshape(9, 9), axis=1)
+    cols = np.bitwise_or.reduce(bits.reshape(9, 9), axis=0)
+    boxes = np.bitwise_or.reduce(bits.reshape(3, 3, 3, 3).transpose(0, 2, 1, 3).reshape(9, 9), axis=1)
+    return rows, cols, boxes
+
+
+def is_solved(board):
+    """True if every row, column and box of the board holds 1..9."""
+    bits = BIT[np.asarray(board).reshape(81)]
+    return bool((np.bitwise_or.reduce(bits[UNITS], axis=1) == ALL).all()
+                and (np.asarray(board).reshape(81) != 0).all())
+
+
+def find_conflicts(board):
+    """Filled cells whose value also appears in one of their peers, as (row, col, value)."""
+    flat = np.asarray(board).reshape(81)
+    clash = ((flat[PEERS] == flat[:, None]).any(axis=1)) & (flat != 0)
+    return [(int(ROW[c]), int(COL[c]), int(flat[c])) for c in np.flatnonzero(clash)]
+
+
+class CandidateGrid:
+    """Unit masks, open cells and per-cell candidate masks of one board."""
+
+    def __init__(self, board=None):
+        self.rows = np.zeros(9, dtype=np.uint16)
+        self.cols = np.zeros(9, dtype=np.uint16)
+        self.boxes = np.zeros(9, dtype=np.uint16)
+        self.cand = np.zeros(81, dtype=np.uint16)
+        self.open = np.zeros(81, dtype=bool)
+        self.board = np.zeros(81, dtype=int)
+        if board is not None:
+            self.load(board)
+
+    def load(self, board):
+        """Binds the grid to a C-contiguous 9x9 board and rebuilds the unit masks from it."""
+        flat = board.reshape(81)
+        if not np.shares_memory(flat, board):
+            raise ValueError("The board must be a C-contiguous 9x9 array")
+        self.board = flat
+        self.rows, self.cols, self.boxes = unit_masks(flat)
+
+    def open_empty_cells(self):
+        """Puts every empty cell in superposition with all values its units allow."""
+        self.open = self.board == 0
+        self.cand = np.where(self.open, self.free_masks(), 0).astype(np.uint16)
+
+    def free_masks(self):
+        """(81,) masks of the values the units of each cell still allow."""
+        return ALL & ~(self.rows[ROW] | self.cols[COL] | self.boxes[BOX])
+
+    def free_mask(self, cell):
+        return ALL & ~int(self.rows[ROW[cell]] | self.cols[COL[cell]] | self.boxes[BOX[cell]])
+
+    def allows(self, cell, value):
+        """True if no unit of the cell holds value yet."""
+        bit = BIT[value]
+        return not (self.rows[ROW[cell]] | self.cols[COL[cell]] | self.boxes[BOX[cell]]) & bit
+
+    def set_value(self, cell, value):
+        """Writes value to the board and the unit masks (candidates are left untouched)."""
+        bit = BIT[value]
+        self.board[cell] = value
+        self.rows[ROW[cell]] |= bit
+        self.cols[COL[cell]] |= bit
+        self.boxes[BOX[cell]] |= bit
+
+    def clear_value(self, cell):
+        """Empties a filled cell on the board and in the unit masks."""
+        keep = ~BIT[self.board[cell]]
+        self.board[cell] = 0
+        self.rows[ROW[cell]] &= keep
+        self.cols[COL[cell]] &= keep
+        self.boxes[BOX[cell]] &= keep
+
+    def eliminate(self, cell, value):
+        """Removes value from the candidates of the 20 peers of cell; returns the peers that changed."""
+        peers = PEERS[cell]
+        bit = BIT[value]
+        hit = peers[(self.cand[peers] & bit) != 0]
+        self.cand[hit] &= ~bit
+        return hit
+
+    def place(self, cell, value):
+        """Collapses an open cell to value. Returns the peers whose candidates lost value."""
+        self.set_value(cell, value)
+        self.open[cell] = False
+        self.cand[cell] = 0
+        return self.eliminate(cell, value)
+
+
+class QuantumStates(MutableMapping):
+    """The {(row, col): [possible values]} dict of QuantumSudoku, backed by a CandidateGrid.
+
+    Keys are the open cells; values are fresh lists built from the candidate
+    masks, so edit them through assignment (or the game's methods), not in place.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+
+    def _cell(self, key):
+        row, col = key
+        if not (0 <= row < 9 and 0 <= col < 9) or not self.grid.open[row * 9 + col]:
+            raise KeyError(key)
+        return int(row) * 9 + int(col)
+
+    def __getitem__(self, key):
+        return list(MASK_VALUES[self.grid.cand[self._cell(key)]])
+
+    def __setitem__(self, key, values):
+        row, col = key
+        cell = int(row) * 9 + int(col)
+        self.grid.open[cell] = True
+        self.grid.cand[cell] = values_mask(values)
+
+    def __delitem__(self, key):
+        cell = self._cell(key)
+        self.grid.open[cell] = False
+        self.grid.cand[cell] = 0
+
+    def __contains__(self, key):
+        try:
+            self._cell(key)
+        except (KeyError, TypeError, ValueError):
+            return False
+        return True
+
+    def __iter__(self):
+        for cell in np.flatnonzero(self.grid.open):
+            yield int(ROW[cell]), int(COL[cell])
+
+    def __len__(self):
+        return int(self.grid.open.sum())
+
+    def copy(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return repr(self.copy())
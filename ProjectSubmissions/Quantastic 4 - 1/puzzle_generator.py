@@ -0,0 +1,190 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from candidate_masks import ALL, BOX, COL, POPCOUNT, ROW, CandidateGrid, find_conflicts
+from trail_search import TrailSearch
+
+# Exact solution counting and bulk generation of unique-solution puzzles.
+#
+# count_solutions is a bitmask exact-cover search on plain Python ints (the
+# row / column / box masks of the placed values), always branching on the
+# empty cell with the fewest candidates and stopping as soon as `limit`
+# solutions are found; limit=2 is all a uniqueness check needs.
+#
+# make_puzzle fills a random solution (TrailSearch with random value order),
+# then clears cells in random order, keeping a removal only if the puzzle
+# still has exactly one solution. generate_puzzles runs this across a process
+# pool, one SeedSequence child per puzzle, and streams the CSV lines
+#     puzzle,solution,difficulty,givens
+# (81-character strings, 0 for empty) to a file as results arrive.
+
+# Cells to remove per difficulty, as in QuantumSudoku.create_puzzle
+REMOVE_COUNTS = {
+    'easy': 30,
+    'medium': 45,
+    'hard': 55,
+    'quantum': 60
+}
+
+_POPCOUNT = POPCOUNT.tolist()
+_ROW, _COL, _BOX = ROW.tolist(), COL.tolist(), BOX.tolist()
+
+
+def count_solutions(board, limit=2):
+    """Number of solutions of a 9x9 (or flat 81) board, counted up to `limit`."""
+    flat = [int(v) for v in np.asarray(board).reshape(81)]
+    if find_conflicts(np.array(flat)):
+        return 0
+    rows, cols, boxes = [0] * 9, [0] * 9, [0] * 9
+    empty = []
+    for cell, v in enumerate(flat):
+        if v:
+            bit = 1 << (v - 1)
+            rows[_ROW[cell]] |= bit
+            cols[_COL[cell]] |= bit
+            boxes[_BOX[cell]] |= bit
+        else:
+            empty.append(cell)
+
+    def search(empty):
+        if not empty:
+            return 1
+        best, best_free, best_count = -1, 0, 10
+        for k, cell in enumerate(empty):
+            free = ALL & ~(rows[_ROW[cell]] | cols[_COL[cell]] | boxes[_BOX[cell]])
+            n = _POPCOUNT[free]
+            if n < best_count:
+                best, best_free, best_count = k, free, n
+                if n <= 1:
+                    break
+        if best_count == 0:
+            return 0
+        cell = empty[best]
+        rest = empty[:best] + empty[best + 1:]
+        r, c, b = _ROW[cell], _COL[cell], _BOX[cell]
+        total = 0
+        while best_free:
+            bit = best_free & -best_free
+            best_free ^= bit
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+            total += search(rest)
+            rows[r] ^= bit
+            cols[c] ^= bit
+            boxes[b] ^= bit
+            if total >= limit:
+                break
+        return total
+
+    return min(search(empty), limit)
+
+
+def has_unique_solution(board):
+    return count_solutions(board, limit=2) == 1
+
+
+def random_solution(rng=random):
+    """A random solved board: TrailSearch on an empty grid with random value order."""
+    board = np.zeros((9, 9), dtype=int)
+    grid = CandidateGrid(board)
+    grid.open_empty_cells()
+    TrailSearch(grid, rng=rng).run(limit=1)
+    return board
+
+
+def make_puzzle(difficulty='medium', rng=random, solution=None):
+    """(puzzle, solution) with a unique solution and up to REMOVE_COUNTS[difficulty] empty cells.
+
+    Every cell is tried once in random order, so very sparse targets
+    (e.g. 'quantum', 21 givens) stop at the sparsest unique puzzle reached.
+    """
+    solution = random_solution(rng) if solution is None else np.asarray(solution).reshape(9, 9)
+    puzzle = solution.copy()
+    flat = puzzle.reshape(81)
+    remove_count = REMOVE_COUNTS.get(difficulty, 45)
+    removed = 0
+    positions = list(range(81))
+    rng.shuffle(positions)
+    for cell in positions:
+        if removed == remove_count:
+            break
+        value = flat[cell]
+        flat[cell] = 0
+        if has_unique_solution(flat):
+            removed += 1
+        else:
+            flat[cell] = value
+    return puzzle, solution
+
+
+def _board_string(board):
+    return "".join(map(str, np.asarray(board).reshape(81)))
+
+
+def _make_line(args):
+    seed, difficulty = args
+    rng = random.Random(int(seed.generate_state(1)[0]))
+    puzzle, solution = make_puzzle(difficulty, rng)
+    givens = int(np.count_nonzero(puzzle))
+    return f"{_board_string(puzzle)},{_board_string(solution)},{difficulty},{givens}\n"
+
+
+def generate_puzzles(count, difficulties=('medium',), path=None, workers=None, seed=0, chunksize=16):
+    """Generates `count` unique-solution puzzles per difficulty across a process pool.
+
+    Lines are streamed to `path` (CSV with a header) in a reproducible order
+    for a given seed; without a path they are returned as a list. Returns
+    (lines or number written, seconds).
+    """
+    children = np.random.SeedSequence(seed).spawn(count * len(difficulties))
+    tasks = [(children[k * count + i], d) for k, d in enumerate(difficulties) for i in range(count)]
+    start = time.perf_counter()
+    lines = []
+    out = open(path, "w") if path else None
+    try:
+        if out:
+            out.write("puzzle,solution,difficulty,givens\n")
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            for line in pool.map(_make_line, tasks, chunksize=chunksize):
+                if out:
+                    out.write(line)
+                else:
+                    lines.append(line)
+    finally:
+        if out:
+            out.close()
+    return (len(tasks) if out else lines), time.perf_counter() - start
+
+
+def read_puzzles(path):
+    """[(puzzle, solution, difficulty, givens)] from a generate_puzzles file; boards as 9x9 arrays."""
+    puzzles = []
+    with open(path) as f:
+        next(f)
+        for line in f:
+            puzzle, solution, difficulty, givens = line.strip().split(",")
+            puzzles.append((np.array(list(puzzle), dtype=int).reshape(9, 9),
+                            np.array(list(solution), dtype=int).reshape(9, 9), difficulty, int(givens)))
+    return puzzles
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate unique-solution Sudoku puzzles in bulk.")
+    parser.add_argument("--count", type=int, default=100, help="Puzzles per difficulty")
+    parser.add_argument("--difficulty", nargs="+", default=["medium"], choices=list(REMOVE_COUNTS))
+    parser.add_argument("--out", default="puzzles.csv")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    written, elapsed = generate_puzzles(args.count, args.difficulty, args.out, args.workers, args.seed)
+    print(f"Wrote {written} puzzles to {args.out} in {elapsed:.2f} s ({written / elapsed:.1f} puzzles/s)")
+
+
+if __name__ == "__main__":
+    main()
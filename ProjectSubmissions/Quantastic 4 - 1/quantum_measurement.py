@@ -0,0 +1,82 @@
+import numpy as np
+from qiskit import ClassicalRegister, QuantumCircuit, QuantumRegister, transpile
+from qiskit.quantum_info import Statevector
+
+# Measurement layer for QuantumSudoku.
+#
+# The measurement circuit of a cell depends only on how many values it can
+# still take (n = 1..9): H on every qubit, a CX chain, measure all. So each
+# process builds at most 9 circuits, and their outcome distributions are
+# computed once, exactly, from the statevector of the circuit without its
+# final measurements. Measurements then draw shots from the cached
+# distribution instead of transpiling and running a simulator job per cell.
+# Transpiled circuits are cached per backend for callers that still want Aer.
+
+SHOTS = 1024
+
+_circuits = {}
+_compiled = {}
+_distributions = {}
+_rng = np.random.default_rng()
+
+
+def seed(value):
+    """Seeds the sampler used by sample_counts when no rng is passed."""
+    global _rng
+    _rng = np.random.default_rng(value)
+
+
+def measurement_circuit(n):
+    """The (shared, cached) n-qubit measurement circuit of a cell with n possible values."""
+    n = min(n, 9)
+    if n not in _circuits:
+        qr = QuantumRegister(n, 'q')
+        cr = ClassicalRegister(n, 'c')
+        circuit = QuantumCircuit(qr, cr)
+        # Put all qubits in superposition
+        circuit.h(qr)
+        # Entangle qubits to enforce Sudoku constraints
+        for i in range(n - 1):
+            circuit.cx(qr[i], qr[i + 1])
+        circuit.measure(qr, cr)
+        _circuits[n] = circuit
+    return _circuits[n]
+
+
+def compiled_circuit(n, backend):
+    """measurement_circuit(n) transpiled for backend, once per (n, backend)."""
+    key = (min(n, 9), backend.name)
+    if key not in _compiled:
+        _compiled[key] = transpile(measurement_circuit(n), backend)
+    return _compiled[key]
+
+
+def outcome_distribution(n):
+    """Exact (bitstrings, probabilities) of measuring the n-qubit circuit, in Qiskit bit order."""
+    n = min(n, 9)
+    if n not in _distributions:
+        state = Statevector(measurement_circuit(n).remove_final_measurements(inplace=False))
+        probs = state.probabilities()
+        keep = np.flatnonzero(probs > 1e-12)
+        bitstrings = [format(int(k), f"0{n}b") for k in keep]
+        _distributions[n] = (bitstrings, probs[keep] / probs[keep].sum())
+    return _distributions[n]
+
+
+def outcome_probabilities(n):
+    """{bitstring: probability}, the exact counterpart of counts / shots."""
+    bitstrings, probs = outcome_distribution(n)
+    return dict(zip(bitstrings, probs.tolist()))
+
+
+def sample_counts(n, shots=SHOTS, rng=None):
+    """Counts of `shots` measurements drawn from the cached exact distribution."""
+    bitstrings, probs = outcome_distribution(n)
+    draws = (rng or _rng).multinomial(shots, probs)
+    return {b: int(c) for b, c in zip(bitstrings, draws) if c}
+
+
+def aer_counts(n, backend, shots=SHOTS):
+    """Counts from actually running the cached compiled circuit on backend."""
+    result = backend.run(compiled_circuit(n, backend), shots=shots).result()
+    return result.get_counts()
@@ -0,0 +1,110 @@
+import numpy as np
+
+from candidate_masks import BIT, MASK_VALUES, POPCOUNT
+
+# Iterative backtracking over a CandidateGrid.
+#
+# The next cell is always the open cell with the fewest candidates (MRV), so
+# forced cells are filled first and dead ends (a cell with no candidate) are
+# found as soon as they appear. Instead of copying the candidate state
+# before every trial value, each placement pushes one trail entry
+#     (cell, value, candidates of cell before, peers that lost value)
+# and undoing it is the exact inverse: clear the cell, restore its mask and
+# OR the value's bit back into those peers. The explicit stack replaces the
+# one-call-per-cell recursion.
+
+
+class TrailSearch:
+    """MRV depth-first search with an undo trail; counts nodes and backtracks.
+
+    on_place(cell, value) / on_undo(cell) are optional callbacks (e.g. for
+    visualisation) run after every placement and removal. Values are tried in
+    increasing order, or in random order when an rng (random.Random or
+    anything with choice()) is given.
+    """
+
+    def __init__(self, grid, on_place=None, on_undo=None, rng=None):
+        self.grid = grid
+        self.on_place = on_place
+        self.on_undo = on_undo
+        self.rng = rng
+        self.nodes = 0
+        self.backtracks = 0
+        self.solutions = []
+
+    def _place(self, cell, value):
+        saved = self.grid.cand[cell]
+        hit = self.grid.place(cell, value)
+        self.nodes += 1
+        if self.on_place:
+            self.on_place(cell, value)
+        return saved, hit
+
+    def _undo(self, cell, value, saved, hit):
+        grid = self.grid
+        grid.clear_value(cell)
+        grid.open[cell] = True
+        grid.cand[cell] = saved
+        grid.cand[hit] |= BIT[value]
+        self.backtracks += 1
+        if self.on_undo:
+            self.on_undo(cell)
+
+    def _next_cell(self):
+        """(cell, candidate mask) of the most constrained open cell, or (None, 0) when none is open."""
+        grid = self.grid
+        counts = np.where(grid.open, POPCOUNT[grid.cand], 10)
+        cell = int(np.argmin(counts))
+        if counts[cell] == 10:
+            return None, 0
+        return cell, int(grid.cand[cell])
+
+    def run(self, limit=1, keep_solutions=False):
+        """Searches until `limit` solutions are found or the tree is exhausted; returns the count.
+
+        If the limit is reached the board is left at the last solution;
+        otherwise every placement is undone. With keep_solutions, copies of
+        the solved boards are stored in self.solutions.
+        """
+        found = 0
+        stack = []                       # frames: [cell, untried mask, placed value, saved mask, hit]
+        descend = True
+        while True:
+            if descend:
+                cell, mask = self._next_cell()
+                if cell is None:
+                    found += 1
+                    if keep_solutions:
+                        self.solutions.append(self.grid.board.reshape(9, 9).copy())
+                    if found >= limit:
+                        return found
+                elif mask:
+                    stack.append([cell, mask, 0, 0, None])
+            # Advance the deepest frame to its next value, unwinding exhausted frames
+            descend = False
+            while stack:
+                frame = stack[-1]
+                cell, mask, value = frame[0], frame[1], frame[2]
+                if value:
+                    self._undo(cell, value, frame[3], frame[4])
+                    frame[2] = 0
+                if not mask:
+                    stack.pop()
+                    continue
+                if self.rng is None:
+                    bit = mask & -mask
+                else:
+                    bit = 1 << (int(self.rng.choice(MASK_VALUES[mask])) - 1)
+                frame[1] = mask ^ bit
+                frame[2] = bit.bit_length()
+                frame[3], frame[4] = self._place(cell, frame[2])
+                descend = True
+                break
+            if not descend:
+                return found
+
+
+def solve_grid(grid, on_place=None, on_undo=None):
+    """Fills the grid's board with a solution if one exists. Returns (solved, search)."""
+    search = TrailSearch(grid, on_place, on_undo)
+    return search.run(limit=1) == 1, search
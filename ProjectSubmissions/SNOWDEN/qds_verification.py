@@ -0,0 +1,162 @@
+"""
+Fast swap-test verification engine for the quantum digital signature (QDS) notebook.
+
+Every public-key state in QDS.ipynb is a single qubit prepared by one rotation,
+|f_k> = Ry(alpha)|0> with alpha = 2*j*theta = j*pi/L, j = int(k, 2) mod L.
+For two such states the swap-test ancilla is measured as 0 with probability
+
+    P(0) = (1 + |<f_a|f_b>|^2) / 2 = (1 + cos^2((alpha_a - alpha_b) / 2)) / 2
+
+so there is no need to build and simulate one cirq circuit per test.  The
+engine works directly on arrays of angles and supports two modes:
+
+  - "exact":   uses P(0) itself as the swap-test statistic.
+  - "sampled": draws all M x T swap tests at once as binomial samples with
+               `repetitions` shots each, like the cirq simulation does.
+
+In both modes a test fails if its statistic is below `swap_threshold`, and the
+signature outcome ("1-ACC" / "0-ACC" / "REJ") is decided from the fraction of
+failed tests using the c1 / c2 thresholds of `verify_signature`.
+"""
+
+import numpy as np
+
+MODES = ("exact", "sampled")
+
+
+def key_angle(key: str) -> float:
+    """Rotation angle 2*j*theta used by quantum_one_way_function for bit-string `key`."""
+    L = len(key)
+    j = int(key, 2) % L
+    return j * np.pi / L
+
+
+def key_angles(keys) -> np.ndarray:
+    """Vectorised key_angle for a list of bit-strings."""
+    return np.array([key_angle(k) for k in keys], dtype=float)
+
+
+def circuit_angles(circuit, qubits) -> np.ndarray:
+    """
+    Reads the total Ry angle applied to each qubit of a state-preparation circuit
+    (as returned by prepare_state_circuit), so existing cirq public keys can be
+    fed to the engine without simulating them.
+    """
+    import cirq
+
+    index = {q: i for i, q in enumerate(qubits)}
+    angles = np.zeros(len(qubits))
+    for op in circuit.all_operations():
+        if not isinstance(op.gate, cirq.Ry):
+            raise ValueError(f"Unsupported gate in public key circuit: {op.gate}")
+        angles[index[op.qubits[0]]] += op.gate.exponent * np.pi
+    return angles
+
+
+def public_key_angles(public_keys_b) -> np.ndarray:
+    """
+    Converts M public keys into an (M, T) angle array.  Accepts angle arrays
+    (passed through), PublicKeyStates from generate_keys (read directly, no
+    circuits built) or a list of (circuit, qubits) tuples.
+    """
+    if isinstance(public_keys_b, np.ndarray):
+        return public_keys_b
+    if hasattr(public_keys_b, "angles"):
+        angles = public_keys_b.angles
+        return np.broadcast_to(angles[:, None], (len(angles), public_keys_b.T))
+    return np.array([circuit_angles(circuit, qubits) for circuit, qubits in public_keys_b])
+
+
+def swap_test_acceptance(angles_a, angles_b) -> np.ndarray:
+    """Exact probability that the swap-test ancilla reads 0 (broadcasts over inputs)."""
+    delta = np.asarray(angles_a) - np.asarray(angles_b)
+    return 0.5 * (1.0 + np.cos(delta / 2.0) ** 2)
+
+
+def classify(error_fraction, c1: float, c2: float):
+    """Maps error fractions to "1-ACC" / "0-ACC" / "REJ" (works on scalars and arrays)."""
+    error_fraction = np.asarray(error_fraction)
+    outcome = np.where(error_fraction <= c1, "1-ACC",
+                       np.where(error_fraction >= c2, "REJ", "0-ACC"))
+    return outcome.item() if outcome.ndim == 0 else outcome
+
+
+class SwapTestVerifier:
+    """
+    Verifies QDS signatures from angle arrays.
+
+    Parameters:
+      c1: acceptance threshold fraction (errors <= c1 * tests -> "1-ACC").
+      c2: rejection threshold fraction (errors >= c2 * tests -> "REJ").
+      swap_threshold: minimum swap-test statistic for a single test to pass.
+      mode: "exact" or "sampled".
+      repetitions: shots per swap test in "sampled" mode.
+      error_probability: extra chance that any single test fails (sampled mode),
+                         mirroring verify_signature_with_errors.
+      seed: seed or numpy Generator for the sampled mode.
+    """
+
+    def __init__(self, c1=0.2, c2=0.5, swap_threshold=0.95, mode="exact",
+                 repetitions=100, error_probability=0.0, seed=None):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        if not c1 < c2:
+            raise ValueError("thresholds must satisfy c1 < c2")
+        self.c1 = c1
+        self.c2 = c2
+        self.swap_threshold = swap_threshold
+        self.mode = mode
+        self.repetitions = repetitions
+        self.error_probability = error_probability
+        self.rng = np.random.default_rng(seed)
+
+    def test_statistics(self, revealed_angles, stored_angles) -> np.ndarray:
+        """
+        Swap-test statistic (P(0) or the sampled fraction of 0 outcomes) for every test.
+
+        revealed_angles has shape (..., M); stored_angles has shape (M,) or (M, T).
+        The result has shape (..., M, T): one test per stored copy.
+        """
+        revealed = np.asarray(revealed_angles, dtype=float)[..., None]
+        stored = np.asarray(stored_angles, dtype=float)
+        if stored.ndim == 1:
+            stored = stored[:, None]
+        p0 = swap_test_acceptance(revealed, stored)
+        if self.mode == "exact":
+            return p0
+        zeros = self.rng.binomial(self.repetitions, p0)
+        stats = zeros / self.repetitions
+        if self.error_probability > 0:
+            stats = np.where(self.rng.random(stats.shape) < self.error_probability, 0.0, stats)
+        return stats
+
+    def error_counts(self, revealed_angles, stored_angles) -> np.ndarray:
+        """Number of failed swap tests per signature (shape (...,))."""
+        stats = self.test_statistics(revealed_angles, stored_angles)
+        return np.count_nonzero(stats < self.swap_threshold, axis=(-2, -1))
+
+    def verify_angles(self, revealed_angles, stored_angles):
+        """
+        Verifies one signature (revealed_angles of shape (M,)) or a batch of them
+        (shape (S, M)).  Returns (outcome, error_count) — strings/ints for a single
+        signature, arrays for a batch.
+        """
+        stats = self.test_statistics(revealed_angles, stored_angles)
+        errors = np.count_nonzero(stats < self.swap_threshold, axis=(-2, -1))
+        num_tests = stats.shape[-2] * stats.shape[-1]
+        outcome = classify(errors / num_tests, self.c1, self.c2)
+        if np.ndim(errors) == 0:
+            return outcome, int(errors)
+        return outcome, errors
+
+    def verify_signature(self, b: int, signature, public_keys):
+        """
+        Drop-in counterpart of the notebook's verify_signature.
+
+        signature: tuple (b, [k1^b, ..., k_M^b]).
+        public_keys: dict {0: ..., 1: ...} whose entries are PublicKeyStates,
+                     lists of (circuit, qubits) or (M, T) angle arrays.
+        """
+        revealed = key_angles(signature[1])
+        stored = public_key_angles(public_keys[b])
+        return self.verify_angles(revealed, stored)
@@ -2,6 +2,11 @@ import math
 import numpy as np
 import dimod
 
+import qubo_builder
+import solution_decoder
+import tsp_decomposition
+from qubo_sampler import QUBOSampler
+
 def create_data_model():
    
     data = {}
@@ -13,13 +18,7 @@ def create_data_model():
 
 def compute_distance_matrix(locations):
     
-    n = len(locations)
-    dist = np.zeros((n, n))
-    for i in range(n):
-        for j in range(n):
-            dist[i, j] = math.hypot(locations[i][0] - locations[j][0],
-                                    locations[i][1] - locations[j][1])
-    return dist
+    return qubo_builder.compute_distance_matrix(locations)
 
 def build_tsp_qubo(dist, A=1000, B=1000):
     
@@ -31,7 +30,7 @@ def build_tsp_qubo(dist, A=1000, B=1000):
         for j in range(n):
             idx = i * n + j
             
-            Q[(idx, idx)] = Q.get((idx, idx), 0) - 2 * A
+            Q[(idx, idx)] = Q.get((idx, idx), 0) - A
         for j in range(n):
             for k in range(j + 1, n):
                 idx1 = i * n + j
@@ -42,7 +41,7 @@ def build_tsp_qubo(dist, A=1000, B=1000):
     for j in range(n):
         for i in range(n):
             idx = i * n + j
-            Q[(idx, idx)] = Q.get((idx, idx), 0) - 2 * B
+            Q[(idx, idx)] = Q.get((idx, idx), 0) - B
         for i in range(n):
             for k in range(i + 1, n):
                 idx1 = i * n + j
@@ -60,24 +59,28 @@ def build_tsp_qubo(dist, A=1000, B=1000):
                     Q[(idx1, idx2)] = Q.get((idx1, idx2), 0) + dist[i][k]
     return Q
 
-def solve_tsp_qubo(Q):
+def solve_tsp_qubo(Q, method="sa", num_reads=32, return_sampleset=False, **sampler_params):
    
-    bqm = dimod.BinaryQuadraticModel.from_qubo(Q)
-    sampler = dimod.ExactSolver()
-    sample_set = sampler.sample(bqm)
+    # ExactSolver enumerates all 2^(n^2) states; sample heuristically instead
+    sampler = QUBOSampler()
+    if isinstance(Q, dimod.BinaryQuadraticModel):
+        sample_set = sampler.sample(Q, method=method, num_reads=num_reads, **sampler_params)
+    elif isinstance(Q, dict):
+        sample_set = sampler.sample_qubo(Q, method=method, num_reads=num_reads, **sampler_params)
+    else:
+        sample_set = sampler.sample_matrix(Q, method=method, num_reads=num_reads, **sampler_params)
     best_sample = sample_set.first.sample
     best_energy = sample_set.first.energy
+    if return_sampleset:
+        return best_sample, best_energy, sample_set
     return best_sample, best_energy
 
 def parse_solution(sample, n):
 
-    tour = [-1] * n
-    for i in range(n):
-        for j in range(n):
-            idx = i * n + j
-            if sample.get(idx, 0) == 1:
-                tour[j] = i
-    return tour
+    # Infeasible samples are repaired to the nearest permutation instead of leaving -1 entries
+    x = np.array([sample.get(idx, 0) for idx in range(n * n)])
+    tours, _ = solution_decoder.decode(x, n)
+    return tours[0].tolist()
 
 def main():
     
@@ -85,19 +88,28 @@ def main():
     locations = data["locations"]
     n = len(locations)
 
+    if n > tsp_decomposition.CLUSTER_SIZE:
+        # Too many locations for one n^2-variable QUBO: cluster, solve, stitch, refine
+        tour, info = tsp_decomposition.solve_clustered(locations)
+        print("Best tour (by city indices):", tour.tolist())
+        print("Tour length:", info["length"])
+        return
+
     
     dist = compute_distance_matrix(locations)
 
     
-    Q = build_tsp_qubo(dist, A=1000, B=1000)
+    Q = qubo_builder.build_tsp_qubo_sparse(dist)
 
     
-    best_sample, energy = solve_tsp_qubo(Q)
-
+    best_sample, energy, sample_set = solve_tsp_qubo(Q, return_sampleset=True)
 
-    tour = parse_solution(best_sample, n)
-    print("Best tour (by city indices):", tour)
+    # Decode every sample at once: repair broken one-hot rows, then 2-opt
+    tours, lengths, info = solution_decoder.decode_sampleset(sample_set, dist)
+    print("Best tour (by city indices):", tours[0].tolist())
+    print("Tour length:", lengths[0])
     print("Energy (objective value):", energy)
+    print("Feasible samples before repair:", info["feasible_fraction"])
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,121 @@
+import os
+
+import numpy as np
+import dimod
+
+from qubo_sampler import _run_tasks, _split, _sweep, _sweep_blocks, as_qubo_matrix, color_classes, default_beta_range
+
+# Parallel tempering (replica exchange) for the penalty-heavy QUBOs of this
+# project, e.g. build_tsp_qubo_sparse(dist) (one-hot penalties equal to the
+# largest distance, or larger ones passed as A and B) or the Uncertain
+# route model (any input accepted by qubo_sampler.as_qubo_matrix).
+#
+# Each ladder holds one replica per temperature. All replicas of a ladder live
+# in one (num_vars, num_replicas) state matrix and are swept together with the
+# colour-class kernel of qubo_sampler: every class of uncoupled variables is
+# Metropolis-tested for every replica at once, using per-replica inverse
+# temperatures. Every `swap_interval` sweeps, neighbouring
+# temperatures exchange replicas with probability
+#     min(1, exp((beta_k - beta_{k+1}) * (E_k - E_{k+1}))).
+# Independent ladders run in parallel across a process pool.
+
+
+def _tempering_task(args):
+    arrays, betas, num_sweeps, swap_interval, seed = args
+    rng = np.random.default_rng(seed)
+    S, blocks = _sweep_blocks(arrays)
+    linear = arrays[3]
+    n = len(linear)
+    K = len(betas)
+
+    x = rng.integers(0, 2, size=(n, K)).astype(np.int8)
+    xf = x.astype(float)
+    field = linear[:, None] + S @ xf
+    energy = linear @ xf + 0.5 * np.einsum("ik,ik->k", xf, S @ xf)
+
+    # column_beta[c] is the inverse temperature currently assigned to column c;
+    # column_at[k] is the column holding temperature k (swaps only relabel).
+    column_at = np.arange(K)
+    column_beta = np.asarray(betas, dtype=float).copy()
+
+    energy_trace = np.empty((num_sweeps, K))
+    flips = np.zeros(K)
+    swap_attempts = np.zeros(K - 1)
+    swap_accepts = np.zeros(K - 1)
+    best_energy = np.inf
+    best_x = x[:, 0].copy()
+
+    for sweep in range(num_sweeps):
+        change, sweep_flips = _sweep(x, field, blocks, -np.log(rng.random((n, K))) / column_beta)
+        energy += change
+        flips += sweep_flips[column_at]
+
+        energy_trace[sweep] = energy[column_at]
+        c = int(np.argmin(energy))
+        if energy[c] < best_energy:
+            best_energy = energy[c]
+            best_x = x[:, c].copy()
+
+        if (sweep + 1) % swap_interval == 0:
+            # Alternate even / odd pairs so every pair is tried
+            for k in range((sweep // swap_interval) % 2, K - 1, 2):
+                a, b = column_at[k], column_at[k + 1]
+                log_ratio = (column_beta[a] - column_beta[b]) * (energy[a] - energy[b])
+                swap_attempts[k] += 1
+                if log_ratio >= 0 or rng.random() < np.exp(log_ratio):
+                    swap_accepts[k] += 1
+                    column_at[k], column_at[k + 1] = b, a
+                    column_beta[a], column_beta[b] = column_beta[b], column_beta[a]
+
+    return {
+        "best_sample": best_x.astype(np.int8),
+        "energy_trace": energy_trace,
+        "flip_rate": flips / (num_sweeps * n),
+        "swap_rate": np.divide(swap_accepts, swap_attempts,
+                               out=np.zeros(K - 1), where=swap_attempts > 0),
+    }
+
+
+class ParallelTemperingSampler(dimod.Sampler):
+    """Replica-exchange Monte Carlo sampler for QUBOs.
+
+    Returns one sample per ladder (the lowest-energy state seen by any of
+    its replicas). ``sampleset.info`` carries the diagnostics:
+
+      - ``betas``: the inverse-temperature ladder (hot to cold),
+      - ``energy_trace``: (ladders, sweeps, temperatures) energies per sweep,
+      - ``flip_rate``: (ladders, temperatures) Metropolis acceptance rates,
+      - ``swap_rate``: (ladders, temperatures - 1) replica-exchange acceptance rates.
+    """
+
+    parameters = {
+        "num_ladders": [], "num_temperatures": [], "num_sweeps": [], "beta_range": [],
+        "swap_interval": [], "workers": [], "seed": [],
+    }
+    properties = {}
+
+    def sample(self, bqm, **parameters):
+        return self.sample_matrix(bqm, **parameters)
+
+    def sample_matrix(self, Q, num_ladders=4, num_temperatures=16, num_sweeps=500,
+                      beta_range=None, swap_interval=1, workers=None, seed=None):
+        U, offset, labels = as_qubo_matrix(Q)
+        linear, S = _split(U)
+        arrays = (S.indptr, S.indices, S.data, linear, color_classes(S))
+        hot, cold = beta_range or default_beta_range(U)
+        betas = np.geomspace(hot, cold, num_temperatures)
+
+        seeds = np.random.SeedSequence(seed).spawn(num_ladders)
+        tasks = [(arrays, betas, num_sweeps, swap_interval, s) for s in seeds]
+        results = _run_tasks(_tempering_task, tasks, workers or os.cpu_count() or 1)
+
+        X = np.array([r["best_sample"] for r in results])
+        Xf = X.astype(float)
+        energies = np.einsum("ij,ij->i", Xf, (U @ Xf.T).T) + offset
+        info = {
+            "betas": betas,
+            "energy_trace": np.array([r["energy_trace"] for r in results]) + offset,
+            "flip_rate": np.array([r["flip_rate"] for r in results]),
+            "swap_rate": np.array([r["swap_rate"] for r in results]),
+        }
+        return dimod.SampleSet.from_samples((X, labels), dimod.BINARY, energy=energies, info=info)
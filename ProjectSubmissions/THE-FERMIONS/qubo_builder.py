@@ -0,0 +1,80 @@
+import numpy as np
+import scipy.sparse as sp
+import dimod
+
+# Vectorized construction of the TSP QUBO from "QUBO(source code ).py".
+#
+# Variable x[i*n + j] = 1 means city i is visited at tour position j. The
+# QUBO is built directly as a sparse upper-triangular matrix U (diagonal =
+# linear terms), so that energy(x) = x^T U x, using Kronecker products:
+#
+#   same city, two positions   (i, j) - (i, k), j < k :  2A * kron(I_n, T)
+#   same position, two cities  (i, j) - (k, j), i < k :  2B * kron(T, I_n)
+#   distance term              (i, j) - (k, j+1), i != k : kron(D, P)
+#
+# where T is the strictly upper-triangular all-ones matrix, D the distance
+# matrix with a zero diagonal and P the cyclic "next position" shift. The
+# diagonal is -(A + B), so a one-hot row with k ones costs A (k - 1)^2 - A:
+# a repeated city or position is penalised, not only a missing one.
+# The energies match build_tsp_qubo exactly.
+
+
+def compute_distance_matrix(locations):
+    """Euclidean distance matrix of an (n, 2) array of coordinates via broadcasting."""
+    pts = np.asarray(locations, dtype=float)
+    diff = pts[:, None, :] - pts[None, :, :]
+    return np.sqrt((diff ** 2).sum(axis=-1))
+
+
+def default_penalty(dist):
+    """The largest distance: dropping a city saves at most two edges, so breaking a constraint never pays.
+
+    Larger penalties only steepen the landscape and make samplers slower to
+    find short tours.
+    """
+    return float(np.max(dist)) if np.size(dist) else 1.0
+
+
+def build_tsp_qubo_sparse(dist, A=None, B=None, format="csr"):
+    """Returns the TSP QUBO as a sparse upper-triangular (n^2 x n^2) matrix; A and B default to default_penalty."""
+    dist = np.asarray(dist, dtype=float)
+    n = len(dist)
+    A = default_penalty(dist) if A is None else A
+    B = default_penalty(dist) if B is None else B
+    eye = sp.identity(n, format="csr")
+    upper = sp.triu(np.ones((n, n)), k=1, format="csr")
+    shift = sp.csr_matrix((np.ones(n), (np.arange(n), (np.arange(n) + 1) % n)), shape=(n, n))
+    d = dist.copy()
+    np.fill_diagonal(d, 0.0)
+
+    M = 2 * A * sp.kron(eye, upper) + 2 * B * sp.kron(upper, eye) + sp.kron(sp.csr_matrix(d), shift)
+    M = M.tocsr()
+    # Fold M into upper-triangular form: x^T M x == x^T U x
+    linear = -(A + B) * np.ones(n * n) + M.diagonal()
+    U = sp.triu(M + M.T, k=1) + sp.diags(linear)
+    U = U.asformat(format)
+    U.eliminate_zeros()
+    return U
+
+
+def qubo_to_bqm(Q, offset=0.0):
+    """Builds a dimod BinaryQuadraticModel straight from a sparse QUBO matrix (no dict)."""
+    Q = sp.coo_matrix(Q)
+    on_diag = Q.row == Q.col
+    linear = np.zeros(Q.shape[0])
+    np.add.at(linear, Q.row[on_diag], Q.data[on_diag])
+    off = ~on_diag
+    quadratic = (Q.row[off], Q.col[off], Q.data[off])
+    return dimod.BinaryQuadraticModel.from_numpy_vectors(linear, quadratic, offset, dimod.BINARY)
+
+
+def qubo_to_dict(Q):
+    """Converts a sparse QUBO matrix back to the {(u, v): bias} form used by dimod.from_qubo."""
+    Q = sp.coo_matrix(Q)
+    return {(int(r), int(c)): float(v) for r, c, v in zip(Q.row, Q.col, Q.data)}
+
+
+def qubo_energies(Q, samples):
+    """Energy x^T Q x of every row of a (num_samples, num_vars) 0/1 array."""
+    X = np.atleast_2d(np.asarray(samples, dtype=float))
+    return np.einsum("ij,ij->i", X, (sp.csr_matrix(Q) @ X.T).T)
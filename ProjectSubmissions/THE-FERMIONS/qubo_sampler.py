@@ -0,0 +1,270 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+import dimod
+
+# Heuristic QUBO samplers for the TSP QUBOs built in qubo_builder.py.
+#
+# Both samplers keep a "local field" per variable,
+#     field[i] = Q[i, i] + sum_j S[i, j] * x[j]      (S = off-diagonal part of Q + Q^T)
+# so the energy change of flipping x[i] is (1 - 2 x[i]) * field[i], and a flip
+# only touches the CSR row of i. Annealing sweeps whole colour classes at a
+# time (sets of variables with no coupling between them, about 2.5 n
+# classes for the n-city TSP) for all replicas at once. Independent restarts
+# are spread across a process pool, and results come back as a
+# dimod.SampleSet, so parse_solution(sampleset.first.sample, n) keeps working.
+
+
+def as_qubo_matrix(Q):
+    """Normalises a QUBO to (upper-triangular CSR matrix, offset, variable labels).
+
+    Accepts a SciPy sparse matrix, a dense array, a {(u, v): bias} dict, a
+    dimod BinaryQuadraticModel (SPIN models are converted to BINARY) or a
+    Qiskit QuadraticProgram such as the Uncertain route model (constraints
+    are turned into penalties with QuadraticProgramToQubo).
+    """
+    if hasattr(Q, "objective") and hasattr(Q, "variables"):
+        return _quadratic_program_to_matrix(Q)
+    if isinstance(Q, dimod.BinaryQuadraticModel):
+        bqm = Q.change_vartype(dimod.BINARY, inplace=False) if Q.vartype is dimod.SPIN else Q
+        labels = list(bqm.variables)
+        linear, (row, col, data), offset = bqm.to_numpy_vectors(variable_order=labels)
+        n = len(labels)
+        U = sp.coo_matrix((data, (row, col)), shape=(n, n)) + sp.diags(linear)
+        return _upper(U), float(offset), labels
+    if isinstance(Q, dict):
+        labels = sorted({v for edge in Q for v in edge})
+        index = {v: k for k, v in enumerate(labels)}
+        row = np.array([index[u] for u, _ in Q], dtype=np.int64)
+        col = np.array([index[v] for _, v in Q], dtype=np.int64)
+        data = np.array(list(Q.values()), dtype=float)
+        n = len(labels)
+        return _upper(sp.coo_matrix((data, (row, col)), shape=(n, n))), 0.0, labels
+    U = sp.csr_matrix(Q, dtype=float)
+    return _upper(U), 0.0, list(range(U.shape[0]))
+
+
+def _quadratic_program_to_matrix(qp):
+    from qiskit_optimization.converters import QuadraticProgramToQubo
+
+    qubo = QuadraticProgramToQubo().convert(qp)
+    objective = qubo.objective
+    sense = objective.sense.value  # 1 = minimize, -1 = maximize
+    U = sp.csr_matrix(objective.quadratic.to_array()) + sp.diags(objective.linear.to_array())
+    labels = [v.name for v in qubo.variables]
+    return _upper(sense * U), float(sense * objective.constant), labels
+
+
+def _upper(M):
+    """Folds any square matrix into the equivalent upper-triangular QUBO matrix."""
+    M = sp.csr_matrix(M, dtype=float)
+    U = sp.triu(M, k=1) + sp.tril(M, k=-1).T + sp.diags(M.diagonal())
+    U = sp.csr_matrix(U)
+    U.sum_duplicates()
+    U.eliminate_zeros()
+    return U
+
+
+def _split(U):
+    """Linear biases and the symmetric zero-diagonal coupling matrix S of an upper-triangular QUBO."""
+    linear = U.diagonal().copy()
+    off = sp.triu(U, k=1)
+    S = sp.csr_matrix(off + off.T)
+    S.sort_indices()
+    return linear, S
+
+
+def default_beta_range(U):
+    """Hot/cold inverse temperatures in the style of D-Wave's neal sampler.
+
+    At the hot end the largest possible energy change is accepted with
+    probability 1/2, at the cold end the smallest one with probability 1/100.
+    """
+    linear, S = _split(U)
+    max_delta = np.max(np.abs(linear) + np.asarray(abs(S).sum(axis=1)).ravel(), initial=1.0)
+    coeffs = np.abs(np.concatenate([linear, S.data]))
+    coeffs = coeffs[coeffs > 0]
+    min_delta = coeffs.min() if len(coeffs) else 1.0
+    return np.log(2) / max_delta, np.log(100) / min_delta
+
+
+def color_classes(S):
+    """Greedy colouring of the coupling graph of S: arrays of variables with no coupling between them.
+
+    The local fields of one class do not depend on each other, so all its
+    variables can be Metropolis-tested and flipped at once, exactly as if
+    they were visited one by one.
+    """
+    n = S.shape[0]
+    indptr, indices = S.indptr, S.indices
+    color = np.full(n, -1, dtype=np.int64)
+    taken = np.zeros(n + 1, dtype=bool)
+    for i in range(n):
+        used = color[indices[indptr[i]:indptr[i + 1]]]
+        used = used[used >= 0]
+        taken[used] = True
+        color[i] = np.argmin(taken)
+        taken[used] = False
+    order = np.argsort(color, kind="stable")
+    return np.split(order, np.flatnonzero(np.diff(color[order])) + 1)
+
+
+def _sweep_blocks(arrays):
+    """(class, S[:, class]) pairs for _sweep, rebuilt inside a worker from the task arrays."""
+    indptr, indices, data, linear, classes = arrays
+    n = len(linear)
+    S = sp.csr_matrix((data, indices, indptr), shape=(n, n))
+    return S, [(c, S[c].T.tocsr()) for c in classes]
+
+
+def _sweep(x, field, blocks, thresholds):
+    """One Metropolis sweep of every replica, one colour class at a time.
+
+    x (num_vars, replicas) and field are updated in place; a variable flips
+    when its energy change is below its threshold -log(u) / beta. Returns
+    the energy change and the number of flips of each replica.
+    """
+    change = np.zeros(x.shape[1])
+    flips = np.zeros(x.shape[1], dtype=np.int64)
+    for c, S_c in blocks:
+        sign = 1 - 2 * x[c]
+        delta = sign * field[c]
+        flip = delta < thresholds[c]
+        if not flip.any():
+            continue
+        field += S_c @ np.where(flip, sign, 0).astype(float)
+        x[c] ^= flip.view(np.int8)
+        change += np.where(flip, delta, 0.0).sum(axis=0)
+        flips += flip.sum(axis=0)
+    return change, flips
+
+
+def _anneal_task(args):
+    """Simulated annealing for a block of replicas, vectorised across replicas and colour classes.
+
+    State and fields are stored as (num_vars, replicas) so that the column of
+    replicas for one variable is contiguous.
+    """
+    arrays, replicas, betas, seed = args
+    rng = np.random.default_rng(seed)
+    S, blocks = _sweep_blocks(arrays)
+    linear = arrays[3]
+    n = len(linear)
+
+    x = rng.integers(0, 2, size=(n, replicas)).astype(np.int8)
+    field = linear[:, None] + S @ x.astype(float)
+
+    for beta in betas:
+        # Metropolis: accept if delta < -log(u) / beta
+        _sweep(x, field, blocks, -np.log(rng.random((n, replicas))) / beta)
+
+    return x.T.astype(np.int8)
+
+
+def _tabu_task(args):
+    """One-flip tabu search with aspiration; every iteration scores all variables at once."""
+    (indptr, indices, data, linear, _), restarts, (max_iter, tenure, max_stall), seed = args
+    rng = np.random.default_rng(seed)
+    n = len(linear)
+    S = sp.csr_matrix((data, indices, indptr), shape=(n, n))
+
+    results = []
+    for _ in range(restarts):
+        x = rng.integers(0, 2, size=n).astype(np.int8)
+        field = linear + S @ x.astype(float)
+        energy = float(x @ linear + 0.5 * x @ (S @ x))
+        best_x, best_energy = x.copy(), energy
+        tabu_until = np.zeros(n, dtype=np.int64)
+        stall = 0
+
+        for it in range(max_iter):
+            delta = (1 - 2 * x) * field
+            allowed = (tabu_until <= it) | (energy + delta < best_energy - 1e-9)
+            # Random tie-breaking keeps restarts from following identical paths
+            scores = np.where(allowed, delta, np.inf) + rng.random(n) * 1e-9
+            i = int(np.argmin(scores))
+            if not np.isfinite(scores[i]):
+                break
+
+            sign = 1 - 2 * x[i]
+            start, end = indptr[i], indptr[i + 1]
+            field[indices[start:end]] += sign * data[start:end]
+            x[i] ^= 1
+            energy += delta[i]
+            tabu_until[i] = it + tenure
+
+            if energy < best_energy - 1e-9:
+                best_x, best_energy = x.copy(), energy
+                stall = 0
+            else:
+                stall += 1
+                if stall >= max_stall:
+                    break
+
+        results.append(best_x)
+    return np.array(results, dtype=np.int8).reshape(-1, n)
+
+
+def _run_tasks(fn, tasks, workers):
+    if workers == 1 or len(tasks) == 1:
+        return [fn(t) for t in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, tasks))
+
+
+class QUBOSampler(dimod.Sampler):
+    """Simulated annealing / tabu search sampler for (sparse) QUBOs.
+
+    A regular dimod sampler: ``sample(bqm)``, ``sample_qubo(Q)`` and
+    ``sample_ising(h, J)`` all work, and ``sample_matrix(Q)`` takes a SciPy
+    sparse matrix such as the one from ``build_tsp_qubo_sparse`` directly.
+    """
+
+    parameters = {
+        "method": [], "num_reads": [], "num_sweeps": [], "beta_range": [],
+        "max_iter": [], "tenure": [], "max_stall": [], "workers": [], "seed": [],
+    }
+    properties = {"methods": ("sa", "tabu")}
+
+    def sample(self, bqm, **parameters):
+        U, offset, labels = as_qubo_matrix(bqm)
+        return self._sample_upper(U, offset, labels, **parameters)
+
+    def sample_matrix(self, Q, **parameters):
+        U, offset, labels = as_qubo_matrix(Q)
+        return self._sample_upper(U, offset, labels, **parameters)
+
+    def _sample_upper(self, U, offset, labels, method="sa", num_reads=32, num_sweeps=200,
+                      beta_range=None, max_iter=None, tenure=None, max_stall=None,
+                      workers=None, seed=None):
+        n = U.shape[0]
+        linear, S = _split(U)
+        arrays = (S.indptr, S.indices, S.data, linear, color_classes(S) if method == "sa" else None)
+        workers = workers or os.cpu_count() or 1
+        num_tasks = max(1, min(workers, num_reads))
+        reads = [len(chunk) for chunk in np.array_split(np.arange(num_reads), num_tasks)]
+        seeds = np.random.SeedSequence(seed).spawn(num_tasks)
+
+        if method == "sa":
+            hot, cold = beta_range or default_beta_range(U)
+            betas = np.geomspace(hot, cold, num_sweeps)
+            tasks = [(arrays, r, betas, s) for r, s in zip(reads, seeds)]
+            blocks = _run_tasks(_anneal_task, tasks, workers)
+        elif method == "tabu":
+            settings = (max_iter or 50 * n, tenure or max(1, min(20, n // 4)), max_stall or 10 * n)
+            tasks = [(arrays, r, settings, s) for r, s in zip(reads, seeds)]
+            blocks = _run_tasks(_tabu_task, tasks, workers)
+        else:
+            raise ValueError(f"Unknown method {method!r}; choose 'sa' or 'tabu'")
+
+        X = np.vstack(blocks)
+        energies = _energies(U, X) + offset
+        return dimod.SampleSet.from_samples((X, labels), dimod.BINARY, energy=energies,
+                                            info={"method": method})
+
+
+def _energies(U, X):
+    Xf = X.astype(float)
+    return np.einsum("ij,ij->i", Xf, (U @ Xf.T).T)
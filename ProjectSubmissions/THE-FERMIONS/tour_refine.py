@@ -0,0 +1,159 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+# Vectorized local search for TSP tours.
+#
+# Tours are arrays of city indices (a closed cycle). Distances are supplied
+# through a `dist_fn(a, b)` that works element-wise on index arrays, so the
+# same code runs on coordinates (no n x n matrix needed for 10,000 cities)
+# or on a precomputed distance matrix. Candidate moves are restricted to each
+# city's K nearest neighbours; all candidate deltas are scored at once and a
+# batch of improving moves on disjoint stretches of the tour is applied per
+# round. The tour is rotated randomly between rounds so moves across the
+# array boundary are also considered.
+
+
+def euclidean(points):
+    """dist_fn for an (n, 2) array of coordinates."""
+    points = np.asarray(points, dtype=float)
+
+    def dist_fn(a, b):
+        diff = points[a] - points[b]
+        return np.sqrt((diff ** 2).sum(axis=-1))
+    return dist_fn
+
+
+def from_matrix(dist):
+    """dist_fn for a precomputed distance matrix."""
+    dist = np.asarray(dist, dtype=float)
+    return lambda a, b: dist[a, b]
+
+
+def nearest_neighbors(points=None, dist=None, k=8):
+    """(n, k) array of each city's k nearest other cities, from coordinates or a matrix."""
+    if points is not None:
+        points = np.asarray(points, dtype=float)
+        k = min(k, len(points) - 1)
+        _, idx = cKDTree(points).query(points, k=k + 1)
+        return idx[:, 1:]
+    dist = np.asarray(dist, dtype=float)
+    k = min(k, len(dist) - 1)
+    masked = dist + np.diag(np.full(len(dist), np.inf))
+    return np.argsort(masked, axis=1)[:, :k]
+
+
+def tour_length(tour, dist_fn):
+    tour = np.asarray(tour)
+    return float(dist_fn(tour, np.roll(tour, -1)).sum())
+
+
+def _select_disjoint(starts, ends, deltas, n, max_moves):
+    """Greedily picks the best moves whose [start, end] position ranges do not overlap."""
+    taken = np.zeros(n + 1, dtype=bool)
+    chosen = []
+    for m in np.argsort(deltas):
+        s, e = starts[m], ends[m]
+        if not taken[s:e + 1].any():
+            taken[s:e + 1] = True
+            chosen.append(m)
+            if len(chosen) == max_moves:
+                break
+    return chosen
+
+
+def two_opt(tour, dist_fn, neighbors, max_rounds=1000, moves_per_round=None, rng=None):
+    """Neighbour-list 2-opt: replaces edges (a, b), (c, d) with (a, c), (b, d)."""
+    rng = np.random.default_rng(rng)
+    tour = np.array(tour)
+    n = len(tour)
+    if n < 4:
+        return tour
+    k = neighbors.shape[1]
+    moves_per_round = moves_per_round or max(64, n // 16)
+
+    for _ in range(max_rounds):
+        tour = np.roll(tour, rng.integers(n))
+        pos = np.empty(n, dtype=np.int64)
+        pos[tour] = np.arange(n)
+
+        i = np.repeat(np.arange(n - 1), k)                 # position of a
+        c = neighbors[tour[:-1]].ravel()                   # candidate c near a
+        j = pos[c]                                         # position of c
+        valid = (j > i + 1) & (j < n - 1)
+        i, j = i[valid], j[valid]
+        a, b, c, d = tour[i], tour[i + 1], tour[j], tour[j + 1]
+        delta = dist_fn(a, c) + dist_fn(b, d) - dist_fn(a, b) - dist_fn(c, d)
+
+        improving = delta < -1e-10
+        if not improving.any():
+            break
+        i, j, delta = i[improving], j[improving], delta[improving]
+        for m in _select_disjoint(i, j + 1, delta, n, moves_per_round):
+            tour[i[m] + 1:j[m] + 1] = tour[i[m] + 1:j[m] + 1][::-1]
+    return tour
+
+
+def or_opt(tour, dist_fn, neighbors, max_segment=3, max_rounds=1000, moves_per_round=None, rng=None):
+    """Neighbour-list Or-opt: moves a segment of 1..max_segment cities (optionally reversed)
+    to sit between a neighbour c of its first city and c's successor."""
+    rng = np.random.default_rng(rng)
+    tour = np.array(tour)
+    n = len(tour)
+    if n < 5:
+        return tour
+    k = neighbors.shape[1]
+    moves_per_round = moves_per_round or max(64, n // 16)
+
+    for _ in range(max_rounds):
+        tour = np.roll(tour, rng.integers(n))
+        pos = np.empty(n, dtype=np.int64)
+        pos[tour] = np.arange(n)
+        best = []
+
+        for L in range(1, max_segment + 1):
+            # segment occupies positions [i, i + L); needs a predecessor and a successor
+            starts = np.arange(1, n - L)
+            c = neighbors[tour[starts]].ravel()
+            i = np.repeat(starts, k)
+            s0, sL = tour[i], tour[i + L - 1]
+            p, nx = tour[i - 1], tour[i + L]
+            j = pos[c]                                      # insert between positions j and j + 1
+            valid = ((j < i - 1) | (j >= i + L)) & (j < n - 1)
+            i, j, s0, sL, p, nx, c = i[valid], j[valid], s0[valid], sL[valid], p[valid], nx[valid], c[valid]
+            cn = tour[j + 1]
+
+            removal = dist_fn(p, s0) + dist_fn(sL, nx) - dist_fn(p, nx)
+            forward = dist_fn(c, s0) + dist_fn(sL, cn)
+            backward = dist_fn(c, sL) + dist_fn(s0, cn)
+            reverse = backward < forward
+            delta = np.minimum(forward, backward) - dist_fn(c, cn) - removal
+            improving = delta < -1e-10
+            best.append((i[improving], j[improving], np.full(improving.sum(), L),
+                         reverse[improving], delta[improving]))
+
+        i, j, L, reverse, delta = (np.concatenate(parts) for parts in zip(*best))
+        if len(delta) == 0:
+            break
+        starts = np.minimum(i - 1, j)
+        ends = np.maximum(i + L, j + 1)
+        for m in _select_disjoint(starts, ends, delta, n, moves_per_round):
+            seg = tour[i[m]:i[m] + L[m]]
+            seg = seg[::-1] if reverse[m] else seg.copy()
+            if j[m] >= i[m] + L[m]:
+                tour[i[m]:j[m] + 1] = np.concatenate([tour[i[m] + L[m]:j[m] + 1], seg])
+            else:
+                tour[j[m] + 1:i[m] + L[m]] = np.concatenate([seg, tour[j[m] + 1:i[m]]])
+    return tour
+
+
+def refine(tour, dist_fn, neighbors, max_rounds=1000, rng=None):
+    """Alternates 2-opt and Or-opt until neither improves the tour."""
+    rng = np.random.default_rng(rng)
+    length = tour_length(tour, dist_fn)
+    while True:
+        tour = two_opt(tour, dist_fn, neighbors, max_rounds=max_rounds, rng=rng)
+        tour = or_opt(tour, dist_fn, neighbors, max_rounds=max_rounds, rng=rng)
+        new_length = tour_length(tour, dist_fn)
+        if new_length >= length - 1e-9:
+            return tour
+        length = new_length
@@ -0,0 +1,233 @@
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+import tour_refine
+from qubo_builder import build_tsp_qubo_sparse, compute_distance_matrix, default_penalty
+from qubo_sampler import QUBOSampler
+from solution_decoder import decode_sampleset
+
+# Hierarchical (cluster-first, route-second) TSP on top of the QUBO formulation.
+#
+# The one-hot encoding needs n^2 variables and O(n^3) couplings, so the QUBO
+# is only solved on small groups of locations:
+#
+#   1. k-means splits the locations into clusters of about `cluster_size`.
+#   2. Each cluster's QUBO is solved with QUBOSampler, clusters in parallel
+#      across a process pool.
+#   3. The order in which clusters are visited is itself a TSP over the
+#      cluster centroids, solved by the same procedure (recursively when
+#      there are many clusters).
+#   4. Every cluster's cycle is cut open where it best connects to the
+#      previous cluster and points towards the next one, and the paths are
+#      concatenated.
+#   5. Neighbour-list 2-opt / Or-opt from tour_refine.py removes the seams.
+
+CLUSTER_SIZE = 8
+
+
+def kmeans(points, k, max_iter=50, rng=None):
+    """Lloyd's algorithm with k-means++ seeding. Returns (labels, centers)."""
+    rng = np.random.default_rng(rng)
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    k = min(k, n)
+
+    centers = np.empty((k, points.shape[1]))
+    centers[0] = points[rng.integers(n)]
+    closest = ((points - centers[0]) ** 2).sum(axis=1)
+    for c in range(1, k):
+        total = closest.sum()
+        idx = rng.choice(n, p=closest / total) if total > 0 else rng.integers(n)
+        centers[c] = points[idx]
+        closest = np.minimum(closest, ((points - centers[c]) ** 2).sum(axis=1))
+
+    labels = np.full(n, -1)
+    for _ in range(max_iter):
+        _, new_labels = cKDTree(centers).query(points)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        counts = np.bincount(labels, minlength=k)
+        for dim in range(points.shape[1]):
+            sums = np.bincount(labels, weights=points[:, dim], minlength=k)
+            centers[:, dim] = np.divide(sums, counts, out=centers[:, dim], where=counts > 0)
+        # Re-seed empty clusters at the points farthest from their centers
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            far = np.argsort(((points - centers[labels]) ** 2).sum(axis=1))[::-1][:len(empty)]
+            centers[empty] = points[far]
+    return labels, centers
+
+
+def _nonempty_clusters(labels, centers):
+    """(members, centers) of the clusters that kept at least one point.
+
+    With coincident locations k-means can end with empty clusters (ties go to
+    the lowest center); they are dropped together with their centers.
+    """
+    members = [np.flatnonzero(labels == c) for c in range(len(centers))]
+    keep = [c for c, idx in enumerate(members) if len(idx)]
+    return [members[c] for c in keep], centers[keep]
+
+
+def solve_cluster_qubo(points, penalty=None, num_reads=4, seed=None, **sampler_params):
+    """Solves one small cluster with the TSP QUBO and returns a cycle of local indices.
+
+    The one-hot penalties default to qubo_builder.default_penalty (the largest
+    distance), so breaking a constraint never pays off. All samples are decoded together (infeasible
+    ones repaired, then 2-opt) and the shortest tour is returned.
+    """
+    m = len(points)
+    if m <= 3:
+        return np.arange(m)
+    dist = compute_distance_matrix(points)
+    penalty = penalty or default_penalty(dist)
+    Q = build_tsp_qubo_sparse(dist, A=penalty, B=penalty)
+    sampleset = QUBOSampler().sample_matrix(Q, method="tabu", num_reads=num_reads,
+                                            workers=1, seed=seed, **sampler_params)
+    tours, _, _ = decode_sampleset(sampleset, dist)
+    return tours[0]
+
+
+def _solve(points, cluster_size, penalty, num_reads, seed):
+    """Recursive cluster-first solver for one group of points (runs inside one worker)."""
+    points = np.asarray(points, dtype=float)
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    if len(points) <= cluster_size:
+        return solve_cluster_qubo(points, penalty, num_reads, int(seed.generate_state(1)[0]))
+    seeds = seed.spawn(2)
+    k = math.ceil(len(points) / cluster_size)
+    labels, centers = kmeans(points, k, rng=seeds[0])
+    members, centers = _nonempty_clusters(labels, centers)
+    if len(members) == 1:
+        # Coincident points: k-means cannot split them, fall back to equal chunks
+        members = np.array_split(np.arange(len(points)), k)
+        centers = np.array([points[idx].mean(axis=0) for idx in members])
+    member_seeds = seeds[1].spawn(len(members) + 1)
+    order = _solve(centers, cluster_size, penalty, num_reads, member_seeds[-1])
+    cycles = [idx[_solve(points[idx], cluster_size, penalty, num_reads, s)]
+              for idx, s in zip(members, member_seeds)]
+    return stitch(points, [cycles[c] for c in order], centers[order])
+
+
+def _solve_task(args):
+    return _solve(*args)
+
+
+def stitch(points, cycles, centers):
+    """Joins per-cluster cycles (already in visiting order) into one tour.
+
+    Each cycle is entered at the city r that minimises
+        d(previous exit, r) - d(dropped cycle edge) + d(new exit, next centroid)
+    over both traversal directions.
+    """
+    tour = [cycles[0]]
+    for c in range(1, len(cycles)):
+        cyc = cycles[c]
+        if len(cyc) == 1:
+            tour.append(cyc)
+            continue
+        prev_exit = points[tour[-1][-1]]
+        target = centers[(c + 1) % len(cycles)]
+        P = points[cyc]
+        before, after = np.roll(P, 1, axis=0), np.roll(P, -1, axis=0)
+        enter = np.linalg.norm(P - prev_exit, axis=1)
+        # forward: r, r+1, ..., r-1 drops edge (r-1, r); backward: r, r-1, ..., r+1 drops (r, r+1)
+        forward = enter - np.linalg.norm(P - before, axis=1) + np.linalg.norm(before - target, axis=1)
+        backward = enter - np.linalg.norm(P - after, axis=1) + np.linalg.norm(after - target, axis=1)
+        r_f, r_b = int(np.argmin(forward)), int(np.argmin(backward))
+        if forward[r_f] <= backward[r_b]:
+            tour.append(np.roll(cyc, -r_f))
+        else:
+            tour.append(np.roll(cyc[::-1], r_b + 1 - len(cyc)))
+    return np.concatenate(tour)
+
+
+def solve_clustered(locations, cluster_size=CLUSTER_SIZE, penalty=None, num_reads=4,
+                    refine=True, neighbors=8, workers=None, seed=0):
+    """Hierarchical QUBO solver for large TSP instances.
+
+    Returns (tour, info) where tour is an array of location indices and info
+    holds the number of clusters, the stitched and refined tour lengths and
+    the wall time of each stage.
+    """
+    start = time.perf_counter()
+    points = np.asarray(locations, dtype=float)
+    n = len(points)
+    seeds = np.random.SeedSequence(seed).spawn(3)
+
+    k = math.ceil(n / cluster_size)
+    labels, centers = kmeans(points, k, rng=seeds[0])
+    members, centers = _nonempty_clusters(labels, centers)
+    t_cluster = time.perf_counter()
+
+    tasks = [(points[idx], cluster_size, penalty, num_reads, s)
+             for idx, s in zip(members, seeds[1].spawn(len(members)))]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        local = [_solve_task(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            local = list(pool.map(_solve_task, tasks, chunksize=max(1, len(tasks) // (4 * workers))))
+    cycles = [idx[t] for idx, t in zip(members, local)]
+    t_qubo = time.perf_counter()
+
+    order = _solve(centers, cluster_size, penalty, num_reads, seeds[2])
+    tour = stitch(points, [cycles[c] for c in order], centers[order])
+    t_stitch = time.perf_counter()
+
+    dist_fn = tour_refine.euclidean(points)
+    stitched_length = tour_refine.tour_length(tour, dist_fn)
+    if refine and n > 4:
+        tour = tour_refine.refine(tour, dist_fn, tour_refine.nearest_neighbors(points, k=neighbors), rng=seed)
+    end = time.perf_counter()
+
+    info = {
+        "clusters": len(members),
+        "stitched_length": stitched_length,
+        "length": tour_refine.tour_length(tour, dist_fn),
+        "time_kmeans": t_cluster - start,
+        "time_qubo": t_qubo - t_cluster,
+        "time_stitch": t_stitch - t_qubo,
+        "time_refine": end - t_stitch,
+        "time_total": end - start,
+    }
+    return tour, info
+
+
+def benchmark(sizes, cluster_size=CLUSTER_SIZE, num_reads=4, workers=None, seed=0):
+    """Prints tour length against wall time for uniformly random instances of each size."""
+    print(f"{'n':>6} {'clusters':>8} {'stitched':>10} {'refined':>10} {'gain':>6} "
+          f"{'qubo s':>7} {'refine s':>8} {'total s':>8}")
+    rng = np.random.default_rng(seed)
+    for n in sizes:
+        locations = rng.uniform(0, 1000, size=(n, 2))
+        tour, info = solve_clustered(locations, cluster_size=cluster_size, num_reads=num_reads,
+                                     workers=workers, seed=seed)
+        assert np.array_equal(np.sort(tour), np.arange(n))
+        gain = 1 - info["length"] / info["stitched_length"]
+        print(f"{n:6d} {info['clusters']:8d} {info['stitched_length']:10.0f} {info['length']:10.0f} "
+              f"{gain:6.1%} {info['time_qubo']:7.2f} {info['time_refine']:8.2f} {info['time_total']:8.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Clustered QUBO solver benchmark for large TSP instances.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300, 1000, 3000, 10000])
+    parser.add_argument("--cluster-size", type=int, default=CLUSTER_SIZE,
+                        help="Target number of locations per cluster QUBO")
+    parser.add_argument("--num-reads", type=int, default=4, help="Tabu restarts per cluster")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    benchmark(args.sizes, args.cluster_size, args.num_reads, args.workers, args.seed)
+
+
+if __name__ == "__main__":
+    main()
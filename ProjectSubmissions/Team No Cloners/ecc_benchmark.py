@@ -0,0 +1,72 @@
+"""Throughput vs. residual error rate benchmark for the codes in ecc.py.
+
+Each code encodes a random payload, the channel bits go through a binary
+symmetric channel at several flip probabilities, and the decoded payload is
+compared with the original.
+
+    python ecc_benchmark.py --megabytes 4 --flip 0.001 0.01 0.05
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from ecc import CODE_NAMES, flip_bits, get_code
+
+
+def benchmark_code(code, payload, flip_probabilities, rng):
+    """Return one result row per flip probability for ``code`` on ``payload``."""
+    start = time.perf_counter()
+    channel_bits = code.encode_bytes(payload)
+    encode_seconds = time.perf_counter() - start
+
+    original_bits = np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
+    rows = []
+    for p in flip_probabilities:
+        received = flip_bits(channel_bits, p, rng)
+        start = time.perf_counter()
+        decoded = code.decode_bytes(received, len(payload))
+        decode_seconds = time.perf_counter() - start
+
+        decoded_bits = np.unpackbits(np.frombuffer(decoded, dtype=np.uint8))
+        rows.append({
+            'code': code.name,
+            'rate': code.rate,
+            'flip_probability': p,
+            'encode_mb_s': len(payload) / 1e6 / max(encode_seconds, 1e-12),
+            'decode_mb_s': len(payload) / 1e6 / max(decode_seconds, 1e-12),
+            'residual_ber': float(np.count_nonzero(decoded_bits != original_bits)) / len(original_bits),
+        })
+    return rows
+
+
+def print_table(rows):
+    header = f"{'code':<12}{'rate':>7}{'flip p':>10}{'enc MB/s':>11}{'dec MB/s':>11}{'residual BER':>15}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(f"{row['code']:<12}{row['rate']:>7.3f}{row['flip_probability']:>10.4f}"
+              f"{row['encode_mb_s']:>11.1f}{row['decode_mb_s']:>11.1f}{row['residual_ber']:>15.2e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the steganography ECC layer.")
+    parser.add_argument('--megabytes', type=float, default=1.0, help="Payload size in MB")
+    parser.add_argument('--flip', type=float, nargs='+', default=[0.001, 0.01, 0.05],
+                        help="Channel bit-flip probabilities")
+    parser.add_argument('--codes', nargs='+', default=list(CODE_NAMES), choices=CODE_NAMES)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    payload = rng.integers(0, 256, size=int(args.megabytes * 1e6), dtype=np.uint8).tobytes()
+
+    rows = []
+    for name in args.codes:
+        rows.extend(benchmark_code(get_code(name), payload, args.flip, rng))
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
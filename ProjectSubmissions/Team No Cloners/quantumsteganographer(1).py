@@ -2,8 +2,20 @@ import cirq
 import random
 import time
 import getpass
+import numpy as np
 from tqdm import tqdm
 
+from ecc import get_code
+from stego_stream import hack_bits
+
+repetition_code = get_code('repetition')
+
+def to_bits(bit_string):
+    return np.frombuffer(bit_string.encode('ascii'), dtype=np.uint8) - ord('0')
+
+def to_bit_string(bits):
+    return (np.asarray(bits, dtype=np.uint8) + ord('0')).tobytes().decode('ascii')
+
 def print_progress(message, delay=1.5):
     for _ in tqdm(range(100), desc=message, bar_format="{l_bar}{bar} [Elapsed: {elapsed}]"):
         time.sleep(delay / 100)
@@ -34,13 +46,13 @@ use_decoys = input("\nAdd decoy qubits for eavesdropper detection? (yes/no): ").
 # =======================
 # Step 1: Convert Message to Binary
 # =======================
-binary_message = "".join(format(ord(char), '08b') for char in message)
+binary_message = "".join(format(byte, '08b') for byte in message.encode('utf-8'))
 print("\n🔹 Step 1: Message converted to binary:", binary_message)
 print_progress("Converting message to quantum states")
 
 # Apply error correction if enabled
 if use_error_correction:
-    binary_message = ''.join(bit * 3 for bit in binary_message)
+    binary_message = to_bit_string(repetition_code.encode(to_bits(binary_message)))
     print("\n🔹 Error Correction Enabled: Each bit is repeated 3 times.")
     time.sleep(1)
 
@@ -99,13 +111,8 @@ print("\n✅ Quantum Transmission Completed.")
 hack_choice = input("\nSimulate a hacker attempt? (yes/no): ").strip().lower()
 if hack_choice.startswith('y'):
     print("\n🚨 Hacker Attempt Detected! 🚨")
-    hacked_bits = ""
-    for i in range(len(measured_bits)):
-        if random.choice([True, False]):  # 50% chance hacker measures in wrong basis
-            hacked_bits += str(random.choice(['0', '1']))  # Random collapse
-        else:
-            hacked_bits += measured_bits[i]  # Correct measurement
-    measured_bits = hacked_bits
+    # 50% chance per qubit that the hacker measures in the wrong basis and collapses it randomly
+    measured_bits = to_bit_string(hack_bits(to_bits(measured_bits), np.random.default_rng()))
     print("❌ Hacked Binary:", measured_bits)
     time.sleep(1)
 else:
@@ -129,15 +136,13 @@ if use_decoys:
 # =======================
 # Step 7: Decode the Message
 # =======================
-decoded_binary = ""
 if use_error_correction:
-    for i in range(0, len(measured_bits), 3):
-        group = measured_bits[i:i+3]
-        decoded_binary += '1' if group.count('1') >= 2 else '0'
+    decoded_binary = to_bit_string(repetition_code.decode(to_bits(measured_bits)))
 else:
     decoded_binary = measured_bits
 
-decoded_message = "".join(chr(int(decoded_binary[i:i+8], 2)) for i in range(0, len(decoded_binary), 8))
+decoded_bytes = bytes(int(decoded_binary[i:i+8], 2) for i in range(0, len(decoded_binary), 8))
+decoded_message = decoded_bytes.decode('utf-8', errors='replace')
 print("\n✅ Decoded Message:", decoded_message)
 
 print("\n🔹 Quantum Steganography Simulation Complete!")
@@ -1,12 +1,16 @@
 import numpy as np
 
-from qiskit import QuantumCircuit, transpile, assemble
+from qiskit import QuantumCircuit, transpile
 from qiskit.visualization import circuit_drawer
 
 from qiskit_aer import Aer
 
 from qiskit.circuit.library import MCXGate
 
+from circuit_cache import CircuitCache, maze_key
+from grover_engine import GroverSimulator
+from maze_paths import shortest_path_states, simple_path_states
+
 
 
 def create_maze_oracle(maze):
@@ -62,30 +66,121 @@ def create_diffusion_operator(num_qubits):
 
 
 
-def solve_maze_grover(maze, start, end):
-    """Solves the maze using Grover's algorithm."""
+def maze_marked_states(maze, start, end):
+    """Basis states the diagonal oracle marks: no wall cell set, start and end cells set."""
     rows, cols = maze.shape
-    num_qubits = rows * cols
     start_index = start[0] * cols + start[1]
     end_index = end[0] * cols + end[1]
+    free = [i for i in np.flatnonzero(np.asarray(maze).ravel() != 0) if i not in (start_index, end_index)]
+    subsets = np.arange(2 ** len(free), dtype=np.int64)
+    marked = np.full(len(subsets), (1 << start_index) | (1 << end_index), dtype=np.int64)
+    for k, cell in enumerate(free):
+        marked |= ((subsets >> k) & 1) << cell
+    return marked
+
+
+
+def solve_maze_grover(maze, start, end, shots=1024, seed=None, oracle="shortest"):
+    """Solves the maze with Grover's algorithm on a NumPy statevector (no transpilation).
+
+    The oracle is a diagonal phase flip on the cell sets of valid start -> end
+    paths (oracle="shortest" or "simple", found by bitboard BFS / DFS in
+    maze_paths.py; "walls" marks maze_marked_states instead), the diffusion a
+    reflection about the mean, and the iteration count the closed-form optimum.
+    Returns (most_frequent_outcome, counts, solution_path, simulator).
+    """
+    rows, cols = maze.shape
+    if oracle == "shortest":
+        marked = shortest_path_states(maze, start, end)
+    elif oracle == "simple":
+        marked = simple_path_states(maze, start, end)
+    else:
+        marked = maze_marked_states(maze, start, end)
+    grover = GroverSimulator(rows * cols, np.array(marked, dtype=np.int64))
+    counts = grover.sample(shots, seed=seed)
+
+    most_frequent_outcome = max(counts, key=counts.get)
+    solution_path = [(int(i) // cols, int(i) % cols) for i, bit in enumerate(reversed(most_frequent_outcome)) if bit == '1']
+
+    return most_frequent_outcome, counts, solution_path, grover
+
+
+
+# Oracle, diffusion and transpiled Grover circuits, shared by every call.
+# Use CircuitCache(directory=...) to keep them on disk between runs.
+circuit_cache = CircuitCache()
+
+
+
+def cached_maze_oracle(maze, cache=None):
+    """create_maze_oracle, built once per distinct maze array."""
+    cache = circuit_cache if cache is None else cache
+    circuit = cache.get("oracle", maze_key(maze), lambda: create_maze_oracle(maze).definition)
+    return circuit.to_gate(label="MazeOracle")
+
+
+
+def cached_diffusion_operator(num_qubits, cache=None):
+    """create_diffusion_operator, built once per qubit count."""
+    cache = circuit_cache if cache is None else cache
+    circuit = cache.get("diffusion", str(num_qubits), lambda: create_diffusion_operator(num_qubits).definition)
+    return circuit.to_gate(label="Diffusion")
+
+
+
+def build_grover_circuit(maze, num_iterations, cache=None):
+    """Grover circuit with measurements, before transpilation."""
+    rows, cols = maze.shape
+    num_qubits = rows * cols
 
     qc = QuantumCircuit(num_qubits, num_qubits)
     qc.h(range(num_qubits)) # Initial Hadamard gates
 
-    maze_oracle = create_maze_oracle(maze)
-    diffusion = create_diffusion_operator(num_qubits)
-
-    num_iterations = int(np.sqrt(float(2**num_qubits)) * np.pi / 4)
+    maze_oracle = cached_maze_oracle(maze, cache)
+    diffusion = cached_diffusion_operator(num_qubits, cache)
 
     for _ in range(num_iterations):
         qc.append(maze_oracle, range(num_qubits))
         qc.append(diffusion, range(num_qubits))
 
     qc.measure(range(num_qubits), range(num_qubits))
+    return qc
+
+
+
+def cached_grover_circuit(maze, num_iterations, cache=None):
+    """build_grover_circuit, built once per (maze, iterations). Shared: copy() it before modifying."""
+    cache = circuit_cache if cache is None else cache
+    key = f"{maze_key(maze)}-{num_iterations}"
+    return cache.get("grover-logical", key, lambda: build_grover_circuit(maze, num_iterations, cache))
+
+
+
+def compiled_grover_circuit(maze, num_iterations, backend, cache=None):
+    """cached_grover_circuit transpiled for `backend`, transpiled once per (maze, iterations, backend)."""
+    cache = circuit_cache if cache is None else cache
+    key = f"{maze_key(maze)}-{num_iterations}-{backend.name}"
+    return cache.get("grover", key, lambda: transpile(cached_grover_circuit(maze, num_iterations, cache), backend))
+
+
+
+def solve_maze_grover_aer(maze, start, end, shots=1024, cache=None):
+    """Solves the maze using Grover's algorithm.
+
+    Oracle, diffusion, the Grover circuit and its transpiled form come from
+    `cache` (the module's circuit_cache by default), so repeated mazes skip
+    building and transpiling. The returned circuit is the cached one.
+    """
+    maze = np.asarray(maze)
+    rows, cols = maze.shape
+    num_qubits = rows * cols
+
+    num_iterations = int(np.sqrt(float(2**num_qubits)) * np.pi / 4)
 
     simulator = Aer.get_backend('qasm_simulator')
-    transpiled_qc = transpile(qc, simulator)
-    job = simulator.run(transpiled_qc, shots=1024)
+    transpiled_qc = compiled_grover_circuit(maze, num_iterations, simulator, cache)
+    qc = cached_grover_circuit(maze, num_iterations, cache)
+    job = simulator.run(transpiled_qc, shots=shots)
     result = job.result()
     counts = result.get_counts()
 
@@ -108,16 +203,17 @@ maze = np.array(matrix)
 start = (0, 0)
 end = (3, 3)
 
-outcome, counts, solution, qc = solve_maze_grover(maze, start, end) # added qc to returned variables
+if __name__ == "__main__":
+    outcome, counts, solution, grover = solve_maze_grover(maze, start, end)
 
-print("Maze data:\n", maze)
-print("Start:", start, "End:", end)
-print("Most frequent outcome (binary):", outcome)
-print("Solution path (coordinates):", solution)
+    print("Maze data:\n", maze)
+    print("Start:", start, "End:", end)
+    print("Grover iterations:", grover.iterations, "marked states:", len(grover.marked))
+    print("Most frequent outcome (binary):", outcome)
+    print("Solution path (coordinates):", solution)
 
-# Visualize the quantum circuit
-print("\nQuantum Circuit:")
-print(qc) # Print the circuit text
-circuit_drawer(qc, output='text') # Draw the circuit in text format
-# or
-# circuit_drawer(qc, output='mpl', filename='maze_grover_circuit.png') #draw the circuit as an image (requires matplotlib)
+    # Visualize the quantum circuit (Aer version; transpiling it is slow for 16+ qubits)
+    # outcome, counts, solution, qc = solve_maze_grover_aer(maze, start, end)
+    # print(qc) # Print the circuit text
+    # circuit_drawer(qc, output='text') # Draw the circuit in text format
+    # circuit_drawer(qc, output='mpl', filename='maze_grover_circuit.png') #draw the circuit as an image (requires matplotlib)
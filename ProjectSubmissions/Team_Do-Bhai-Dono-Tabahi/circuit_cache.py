@@ -0,0 +1,82 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+from qiskit import qpy
+
+# Content-addressed cache for the circuits of solve_maze_grover_aer.
+#
+# Entries are QuantumCircuits keyed by (kind, key):
+#   ("diffusion", "<num_qubits>")                      diffusion operator
+#   ("oracle", maze_key(maze))                         maze oracle
+#   ("grover", "<maze_key>-<iterations>-<backend>")    full transpiled circuit
+# so identical mazes (and identical sizes, for the diffusion) are built and
+# transpiled once. The in-memory part is an LRU of `maxsize` circuits; with
+# a `directory`, every circuit is also written there as QPY and read back
+# on a memory miss, which shares the work between processes and runs.
+
+CACHE_SIZE = 64
+
+
+def maze_key(maze):
+    """Hash of a maze array (shape, dtype and contents)."""
+    m = np.ascontiguousarray(maze)
+    return hashlib.sha1(repr((m.shape, m.dtype.str)).encode() + m.tobytes()).hexdigest()
+
+
+class CircuitCache:
+    """In-memory LRU of circuits with an optional on-disk QPY store."""
+
+    def __init__(self, maxsize=CACHE_SIZE, directory=None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self._circuits = OrderedDict()
+        self.hits = self.disk_hits = self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, kind, key):
+        return os.path.join(self.directory, f"{kind}-{key}.qpy")
+
+    def _remember(self, entry, circuit):
+        self._circuits[entry] = circuit
+        if len(self._circuits) > self.maxsize:
+            self._circuits.popitem(last=False)
+
+    def get(self, kind, key, build):
+        """The circuit stored under (kind, key), calling build() only if neither memory nor disk has it."""
+        entry = (kind, key)
+        if entry in self._circuits:
+            self.hits += 1
+            self._circuits.move_to_end(entry)
+            return self._circuits[entry]
+        path = self._path(kind, key) if self.directory is not None else None
+        if path is not None and os.path.exists(path):
+            with open(path, "rb") as f:
+                circuit = qpy.load(f)[0]
+            self.disk_hits += 1
+        else:
+            circuit = build()
+            self.misses += 1
+            if path is not None:
+                tmp = f"{path}.{os.getpid()}.tmp"
+                with open(tmp, "wb") as f:
+                    qpy.dump(circuit, f)
+                os.replace(tmp, path)                     # atomic, so parallel writers are safe
+        self._remember(entry, circuit)
+        return circuit
+
+    def clear(self, disk=False):
+        self._circuits.clear()
+        if disk and self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith(".qpy"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def __len__(self):
+        return len(self._circuits)
+
+    def __repr__(self):
+        return (f"CircuitCache(size={len(self)}/{self.maxsize}, hits={self.hits}, "
+                f"disk_hits={self.disk_hits}, misses={self.misses}, directory={self.directory!r})")
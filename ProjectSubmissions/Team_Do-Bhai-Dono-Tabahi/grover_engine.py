@@ -0,0 +1,110 @@
+import numpy as np
+
+# Grover search without circuits.
+#
+# The oracle is diagonal: it multiplies the amplitude of every marked basis
+# state by -1, and the diffusion operator 2|s><s| - I is a reflection of all
+# amplitudes about their mean. Both act directly on a real NumPy statevector
+# (amplitudes stay real throughout Grover's algorithm).
+#
+# Because the oracle only touches the marked states, the state after any
+# number of iterations can be written exactly as
+#     psi = u * (1, 1, ..., 1) + d,     d non-zero only on marked states,
+# and one iteration is O(number of marked states) in that form:
+#     oracle:     d_m -> -2u - d_m
+#     diffusion:  u -> 2 * mean(psi) - u,  d -> -d,  mean(psi) = u + sum(d) / N
+# GroverSimulator.run uses this representation, so 25 qubits with a single
+# marked state (4,500+ iterations) take milliseconds; statevector() runs the
+# dense in-place version and returns the full 2^n vector.
+
+
+def optimal_iterations(num_qubits, num_marked):
+    """Closed-form iteration count floor(pi / (4 theta)), sin(theta) = sqrt(M / N)."""
+    if num_marked == 0:
+        return 0
+    theta = np.arcsin(np.sqrt(num_marked / 2 ** num_qubits))
+    return int(np.floor(np.pi / (4 * theta)))
+
+
+def success_probability(num_qubits, num_marked, iterations):
+    """Probability of measuring a marked state: sin^2((2k + 1) theta)."""
+    theta = np.arcsin(np.sqrt(num_marked / 2 ** num_qubits))
+    return float(np.sin((2 * iterations + 1) * theta) ** 2)
+
+
+def to_bitstring(index, num_qubits):
+    """Qiskit-style bitstring (qubit 0 is the rightmost character)."""
+    return format(int(index), f"0{num_qubits}b")
+
+
+class GroverSimulator:
+    """Grover's algorithm with a diagonal phase oracle given by its marked basis states.
+
+    ``marked`` is an array of basis-state indices or a boolean mask of length 2^n.
+    """
+
+    def __init__(self, num_qubits, marked):
+        self.num_qubits = num_qubits
+        self.size = 2 ** num_qubits
+        marked = np.asarray(marked)
+        if marked.dtype == bool:
+            marked = np.flatnonzero(marked)
+        self.marked = np.unique(marked.astype(np.int64))
+        self.iterations = optimal_iterations(num_qubits, len(self.marked))
+
+    def phase_vector(self):
+        """The oracle as a diagonal of +1 / -1 entries."""
+        phases = np.ones(self.size, dtype=np.int8)
+        phases[self.marked] = -1
+        return phases
+
+    def statevector(self, iterations=None):
+        """Dense simulation: oracle as element-wise phase, diffusion as in-place reflection about the mean."""
+        iterations = self.iterations if iterations is None else iterations
+        psi = np.full(self.size, 1 / np.sqrt(self.size))
+        phases = self.phase_vector()
+        for _ in range(iterations):
+            psi *= phases
+            mean = psi.mean()
+            psi *= -1
+            psi += 2 * mean
+        return psi
+
+    def run(self, iterations=None):
+        """Exact amplitudes after the Grover iterations as (uniform amplitude u, marked amplitudes)."""
+        iterations = self.iterations if iterations is None else iterations
+        u = 1 / np.sqrt(self.size)
+        d = np.zeros(len(self.marked))
+        for _ in range(iterations):
+            d = -2 * u - d
+            mean = u + d.sum() / self.size
+            u = 2 * mean - u
+            d = -d
+        return u, u + d
+
+    def probabilities(self, iterations=None):
+        """Full probability vector over all 2^n basis states."""
+        u, marked_amplitudes = self.run(iterations)
+        probs = np.full(self.size, u * u)
+        probs[self.marked] = marked_amplitudes ** 2
+        return probs
+
+    def sample(self, shots=1024, iterations=None, seed=None):
+        """Measurement counts in Qiskit's {bitstring: count} format."""
+        rng = np.random.default_rng(seed)
+        u, marked_amplitudes = self.run(iterations)
+        p_marked = marked_amplitudes ** 2
+        hits = rng.binomial(shots, min(1.0, p_marked.sum()))
+        outcomes = []
+        if hits and len(self.marked):
+            outcomes.append(rng.choice(self.marked, size=hits, p=p_marked / p_marked.sum()))
+        if shots - hits:
+            # Unmarked states are equally likely: draw uniformly and redraw marked hits
+            draws = rng.integers(0, self.size, size=shots - hits)
+            clash = np.isin(draws, self.marked)
+            while clash.any() and len(self.marked) < self.size:
+                draws[clash] = rng.integers(0, self.size, size=clash.sum())
+                clash = np.isin(draws, self.marked)
+            outcomes.append(draws)
+        values, counts = np.unique(np.concatenate(outcomes), return_counts=True)
+        return {to_bitstring(v, self.num_qubits): int(c) for v, c in zip(values, counts)}
@@ -0,0 +1,242 @@
+import argparse
+import heapq
+import time
+
+import numpy as np
+
+from grover_engine import GroverSimulator, success_probability
+
+# Classical maze subsystem: bitboards, BFS / A*, and the set of valid paths
+# that the Grover oracle marks.
+#
+# Cell (r, c) is bit r * cols + c, the same numbering as the qubits in
+# Quantum_Maze_Solver.py. A set of cells is a Python int ("bitboard"), so one
+# BFS layer is expanded with four shifts and masks:
+#     right = (f << 1) & ~first_col      left = (f >> 1) & ~last_col
+#     down  = f << cols                  up   = f >> cols
+# A basis state of the Grover register is a bitboard too: the marked states
+# are exactly the cell sets of shortest (or, optionally, all simple)
+# start -> end paths, so measuring a marked state gives a real route.
+
+
+class Bitboard:
+    """Open cells of a 0/1 maze as an integer bitmask, with neighbour expansion."""
+
+    def __init__(self, maze):
+        maze = np.asarray(maze)
+        self.rows, self.cols = maze.shape
+        self.size = self.rows * self.cols
+        self.full = (1 << self.size) - 1
+        self.open = sum(1 << int(i) for i in np.flatnonzero(maze.ravel() != 0))
+        first_col = sum(1 << (r * self.cols) for r in range(self.rows))
+        self.not_first_col = self.full & ~first_col
+        self.not_last_col = self.full & ~(first_col << (self.cols - 1))
+
+    def index(self, cell):
+        return int(cell[0]) * self.cols + int(cell[1])
+
+    def cell(self, index):
+        return divmod(index, self.cols)
+
+    def neighbours(self, board):
+        """All open cells adjacent to any cell in `board`."""
+        spread = (((board << 1) & self.not_first_col) | ((board >> 1) & self.not_last_col)
+                  | (board << self.cols) | (board >> self.cols))
+        return spread & self.open & self.full
+
+    def bits(self, board):
+        return [i for i in range(self.size) if board >> i & 1]
+
+
+def bfs_layers(board, start, end):
+    """Bitboard BFS. Returns the list of distance layers up to the one containing end (or None)."""
+    s, e = 1 << board.index(start), 1 << board.index(end)
+    if not (board.open & s and board.open & e):
+        return None
+    layers = [s]
+    seen = s
+    while not layers[-1] & e:
+        frontier = board.neighbours(layers[-1]) & ~seen
+        if not frontier:
+            return None
+        seen |= frontier
+        layers.append(frontier)
+    return layers
+
+
+def bfs_shortest_path(maze, start, end):
+    """One shortest path as a list of (row, col) cells, or None if end is unreachable."""
+    board = Bitboard(maze)
+    layers = bfs_layers(board, start, end)
+    if layers is None:
+        return None
+    current = 1 << board.index(end)
+    path = [current]
+    for layer in reversed(layers[:-1]):
+        step = board.neighbours(current) & layer
+        current = step & -step                            # lowest set bit
+        path.append(current)
+    return [board.cell(b.bit_length() - 1) for b in reversed(path)]
+
+
+def astar_shortest_path(maze, start, end):
+    """A* with the Manhattan heuristic on the same grid; returns a list of cells or None."""
+    board = Bitboard(maze)
+    s, e = board.index(start), board.index(end)
+    if not (board.open >> s & 1 and board.open >> e & 1):
+        return None
+    er, ec = end
+
+    def h(i):
+        r, c = divmod(i, board.cols)
+        return abs(r - er) + abs(c - ec)
+
+    g = {s: 0}
+    parent = {s: None}
+    heap = [(h(s), 0, s)]
+    while heap:
+        _, dist, i = heapq.heappop(heap)
+        if i == e:
+            path = []
+            while i is not None:
+                path.append(board.cell(i))
+                i = parent[i]
+            return path[::-1]
+        if dist > g[i]:
+            continue
+        for j in board.bits(board.neighbours(1 << i)):
+            if dist + 1 < g.get(j, np.inf):
+                g[j] = dist + 1
+                parent[j] = i
+                heapq.heappush(heap, (dist + 1 + h(j), dist + 1, j))
+    return None
+
+
+def shortest_path_states(maze, start, end):
+    """Bitboards of every shortest start -> end path (the cells each path visits)."""
+    board = Bitboard(maze)
+    layers = bfs_layers(board, start, end)
+    if layers is None:
+        return []
+    # Walk back from end keeping only cells that lie on some shortest path
+    useful = [0] * len(layers)
+    useful[-1] = 1 << board.index(end)
+    for k in range(len(layers) - 2, -1, -1):
+        useful[k] = board.neighbours(useful[k + 1]) & layers[k]
+    # paths[cell] = set of bitboards of shortest paths from start to that cell
+    paths = {board.index(start): {1 << board.index(start)}}
+    for k in range(1, len(layers)):
+        nxt = {}
+        for i in board.bits(useful[k]):
+            prev = board.neighbours(1 << i) & useful[k - 1]
+            nxt[i] = {p | (1 << i) for j in board.bits(prev) for p in paths[j]}
+        paths = nxt
+    return sorted(paths[board.index(end)])
+
+
+def simple_path_states(maze, start, end, max_length=None, limit=100_000):
+    """Bitboards of simple start -> end paths (depth-first, optionally capped in length / count)."""
+    board = Bitboard(maze)
+    s, e = board.index(start), board.index(end)
+    if not (board.open >> s & 1 and board.open >> e & 1):
+        return []
+    max_length = max_length or board.size
+    found = set()
+    stack = [(s, 1 << s)]
+    while stack and len(found) < limit:
+        i, visited = stack.pop()
+        if i == e:
+            found.add(visited)
+            continue
+        if bin(visited).count("1") >= max_length:
+            continue
+        for j in board.bits(board.neighbours(1 << i) & ~visited):
+            stack.append((j, visited | (1 << j)))
+    return sorted(found)
+
+
+def is_valid_path_state(maze, start, end, state):
+    """True if the cells set in `state` are open and connect start to end."""
+    board = Bitboard(maze)
+    s, e = 1 << board.index(start), 1 << board.index(end)
+    if state & ~board.open or not (state & s and state & e):
+        return False
+    reached = s
+    while True:
+        grown = (reached | (board.neighbours(reached) & state))
+        if grown == reached:
+            return bool(reached & e)
+        reached = grown
+
+
+def random_maze(rows, cols, wall_density, rng, start=(0, 0), end=None):
+    end = end or (rows - 1, cols - 1)
+    maze = (rng.random((rows, cols)) >= wall_density).astype(int)
+    maze[start] = maze[end] = 1
+    return maze
+
+
+def benchmark(rows=5, cols=5, count=50, wall_density=0.3, shots=256, paths="shortest", seed=0):
+    """Solves a batch of random mazes classically (BFS, A*) and with Grover on the valid-path oracle.
+
+    Prints per-stage times and success rates for the whole batch.
+    """
+    rng = np.random.default_rng(seed)
+    start, end = (0, 0), (rows - 1, cols - 1)
+    totals = dict(bfs=0.0, astar=0.0, oracle=0.0, grover=0.0)
+    solvable = grover_found = 0
+    p_success = []
+    for _ in range(count):
+        maze = random_maze(rows, cols, wall_density, rng, start, end)
+
+        t0 = time.perf_counter()
+        path = bfs_shortest_path(maze, start, end)
+        t1 = time.perf_counter()
+        astar = astar_shortest_path(maze, start, end)
+        t2 = time.perf_counter()
+        if paths == "shortest":
+            marked = shortest_path_states(maze, start, end)
+        else:
+            marked = simple_path_states(maze, start, end)
+        t3 = time.perf_counter()
+        grover = GroverSimulator(rows * cols, np.array(marked, dtype=np.int64))
+        counts = grover.sample(shots, seed=rng)
+        outcome = int(max(counts, key=counts.get), 2)
+        t4 = time.perf_counter()
+
+        assert (path is None) == (astar is None) and (path is None or len(path) == len(astar))
+        totals["bfs"] += t1 - t0
+        totals["astar"] += t2 - t1
+        totals["oracle"] += t3 - t2
+        totals["grover"] += t4 - t3
+        if path is not None:
+            solvable += 1
+            grover_found += is_valid_path_state(maze, start, end, outcome)
+            p_success.append(success_probability(rows * cols, len(marked), grover.iterations))
+
+    print(f"{count} random {rows}x{cols} mazes, wall density {wall_density}, {solvable} solvable")
+    print(f"{'stage':<28} {'total [ms]':>11} {'per maze [ms]':>14}")
+    for name, label in [("bfs", "BFS (bitboard)"), ("astar", "A* (Manhattan)"),
+                        ("oracle", f"Oracle: {paths} paths"), ("grover", "Grover (statevector)")]:
+        print(f"{label:<28} {1e3 * totals[name]:11.2f} {1e3 * totals[name] / count:14.3f}")
+    if solvable:
+        print(f"Grover returned a valid path for {grover_found}/{solvable} solvable mazes "
+              f"(mean theoretical success probability {np.mean(p_success):.4f})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Classical vs Grover timing on batches of random mazes.")
+    parser.add_argument("--rows", type=int, default=5)
+    parser.add_argument("--cols", type=int, default=5)
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--wall-density", type=float, default=0.3)
+    parser.add_argument("--shots", type=int, default=256)
+    parser.add_argument("--paths", choices=["shortest", "simple"], default="shortest",
+                        help="Which start-to-end paths the oracle marks")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    benchmark(args.rows, args.cols, args.count, args.wall_density, args.shots, args.paths, args.seed)
+
+
+if __name__ == "__main__":
+    main()
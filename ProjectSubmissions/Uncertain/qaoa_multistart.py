@@ -0,0 +1,227 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from multiprocessing import shared_memory
+
+import numpy as np
+from qiskit_optimization.algorithms import (MinimumEigenOptimizationResult, OptimizationResultStatus,
+                                            SolutionSample)
+
+from qaoa_simulator import DiagonalQAOA, program_qubo
+
+# Multi-start QAOA for the route model (or any QuadraticProgram).
+#
+# Every start draws a random depth-1 point, optimises it with one of the
+# given optimizers and warm-starts depths 2..reps by INTERP interpolation
+# (DiagonalQAOA.optimize_to_depth). Starts run across a process pool. The
+# energy and level vectors (2^N entries each) are built once in the parent
+# and handed to the workers through shared memory, and the number of workers
+# is capped so their statevectors fit in the free memory.
+#
+# Results are consumed in submission order, so with time_budget=None the
+# outcome only depends on `seed`. The run stops early once `patience`
+# consecutive starts have not improved the best expectation by more than
+# `tol`, or once the wall-clock budget is used up. Pending starts are then
+# cancelled, and running ones stop at their next cost evaluation: on a
+# timeout they report the best point they evaluated, so the result is the
+# best point seen by any start even if none of them finished.
+
+# Each worker holds about this many state-sized arrays while evaluating
+STATES_PER_WORKER = 4
+
+_simulator = None
+_buffers = []
+_stop = None
+_deadline = None
+
+
+class _Stopped(Exception):
+    pass
+
+
+def _share(array):
+    """Copies an array into a new shared memory block; returns (block, (name, shape, dtype))."""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, array.dtype, buffer=block.buf)[:] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def _attach(name, shape, dtype):
+    block = shared_memory.SharedMemory(name=name)
+    _buffers.append(block)
+    return np.ndarray(shape, dtype, buffer=block.buf)
+
+
+def _init_worker(energies, levels, values, gamma_scale, dtype, stop, deadline):
+    global _simulator, _stop, _deadline
+    _simulator = DiagonalQAOA(_attach(*energies), dtype=dtype,
+                              precomputed=(gamma_scale, values, _attach(*levels)))
+    _stop, _deadline = stop, deadline
+
+
+def _run_start(args):
+    """One start; if stopped, the best point it evaluated (None if none) marked "stopped"."""
+    index, x0, optimizer, reps, maxiter = args
+    start = time.perf_counter()
+    first = _simulator.num_evaluations
+    seen = [np.inf, None]
+
+    def expectation(params):
+        if _stop.is_set() or (_deadline is not None and time.time() > _deadline):
+            raise _Stopped
+        value = DiagonalQAOA.expectation(_simulator, params)
+        if value < seen[0]:
+            seen[:] = [value, np.array(params, dtype=float)]
+        return value
+
+    _simulator.expectation = expectation
+    try:
+        history = _simulator.optimize_to_depth(reps, x0=x0, optimizer=optimizer, maxiter=maxiter)
+        (params, value, _), stopped = history[-1], False
+    except _Stopped:
+        if seen[1] is None:
+            return None
+        (value, params), stopped = seen, True
+    finally:
+        del _simulator.expectation
+    return {
+        "index": index,
+        "optimizer": optimizer if isinstance(optimizer, str) else type(optimizer).__name__,
+        "initial_point": np.asarray(x0),
+        "optimal_point": params,
+        "optimal_value": value,
+        "cost_function_evals": _simulator.num_evaluations - first,
+        "time": time.perf_counter() - start,
+        "stopped": stopped,
+    }
+
+
+class MultiStartQAOAResult:
+    """Eigensolver-style summary stored as ``min_eigen_solver_result`` of the optimization result."""
+
+    def __init__(self, runs, best, eigenstate, num_qubits):
+        self.runs = runs
+        self.optimal_point = best["optimal_point"]
+        self.optimal_value = best["optimal_value"]
+        self.eigenvalue = best["optimal_value"]
+        self.cost_function_evals = sum(r["cost_function_evals"] for r in runs)
+        self.eigenstate = eigenstate          # {bitstring: probability} of the most likely states
+        self.num_qubits = num_qubits
+
+    def __repr__(self):
+        return (f"MultiStartQAOAResult(starts={len(self.runs)}, optimal_value={self.optimal_value:.6g}, "
+                f"cost_function_evals={self.cost_function_evals})")
+
+
+def _max_workers(num_qubits, dtype):
+    """CPU count, capped so every worker's statevectors fit in the free memory."""
+    workers = os.cpu_count() or 1
+    try:
+        free = os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return workers
+    per_worker = STATES_PER_WORKER * 2 ** num_qubits * np.dtype(dtype).itemsize
+    return max(1, min(workers, free // per_worker))
+
+
+def _initial_points(num_starts, gamma_scale, rng):
+    """Random depth-1 points: gamma in (0, 2 / std(E)), beta in (-pi/4, pi/4)."""
+    gammas = rng.uniform(0, 2 * gamma_scale, num_starts)
+    betas = rng.uniform(-np.pi / 4, np.pi / 4, num_starts)
+    return np.column_stack([gammas, betas])
+
+
+def multistart_qaoa(qp, reps=1, num_starts=32, optimizers=("COBYLA", "Nelder-Mead", "Powell"),
+                    maxiter=200, patience=8, tol=1e-6, time_budget=None, workers=None,
+                    num_samples=1024, dtype=np.complex64, seed=0):
+    """Runs QAOA from many starting points and returns a MinimumEigenOptimizationResult.
+
+    The result is shaped like the one from MinimumEigenOptimizer(QAOA(...)).solve(qp):
+    ``x`` / ``fval`` are the best feasible solution among the ``num_samples``
+    most likely states of the best QAOA state, ``samples`` / ``raw_samples``
+    hold those states evaluated on the original problem / the penalised QUBO,
+    and ``min_eigen_solver_result`` is a MultiStartQAOAResult with every run.
+
+    ``workers`` defaults to the CPU count and is capped by free memory. With a
+    ``time_budget``, runs cut short by the deadline contribute the best point
+    they evaluated (``"stopped": True``); TimeoutError is raised only if no
+    cost evaluation at all finished within the budget. The budget covers the
+    starts; evaluating the ``num_samples`` most likely states comes on top.
+    """
+    U, offset = program_qubo(qp)
+    simulator = DiagonalQAOA.from_qubo(U, offset, dtype=dtype)
+    rng = np.random.default_rng(seed)
+    points = _initial_points(num_starts, simulator.gamma_scale, rng)
+    tasks = [(k, points[k], optimizers[k % len(optimizers)], reps, maxiter) for k in range(num_starts)]
+    workers = min(workers or os.cpu_count() or 1, _max_workers(simulator.num_qubits, dtype))
+
+    deadline = None if time_budget is None else time.time() + time_budget
+    stop = multiprocessing.Event()
+    runs, timed_out = [], False
+    best_value, stalled = np.inf, 0
+    blocks = []
+    try:
+        energies_block, energies = _share(simulator.energies)
+        blocks.append(energies_block)
+        levels_block, levels = _share(simulator._levels)
+        blocks.append(levels_block)
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(energies, levels, simulator._values, simulator.gamma_scale,
+                                             dtype, stop, deadline))
+        try:
+            futures = [pool.submit(_run_start, t) for t in tasks]
+            for k, future in enumerate(futures):
+                try:
+                    remaining = None if deadline is None else max(deadline - time.time(), 0)
+                    run = future.result(timeout=remaining)
+                except TimeoutError:
+                    timed_out = True
+                    break
+                if run is None:
+                    continue
+                runs.append(run)
+                if run["optimal_value"] < best_value - tol:
+                    best_value, stalled = run["optimal_value"], 0
+                else:
+                    stalled += 1
+                    if stalled >= patience:
+                        break
+        finally:
+            # Running starts return at their next cost evaluation
+            stop.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+        if timed_out:
+            # Keep the later starts, finished or cut short, that got somewhere
+            for f in futures[k:]:
+                if not f.cancelled() and f.exception() is None and f.result() is not None:
+                    runs.append(f.result())
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+    if not runs:
+        raise TimeoutError("No QAOA cost evaluation finished within the time budget")
+
+    best = min(runs, key=lambda r: r["optimal_value"])
+    bits, probs, energies = simulator.most_likely(best["optimal_point"], k=num_samples)
+    raw_samples = [SolutionSample(x=b, fval=float(e), probability=float(p),
+                                  status=OptimizationResultStatus.SUCCESS)
+                   for b, p, e in zip(bits, probs, energies)]
+    raw_samples.sort(key=lambda s: s.fval)
+
+    samples = []
+    for s in raw_samples:
+        feasible = qp.is_feasible(s.x)
+        samples.append(SolutionSample(
+            x=s.x, fval=float(qp.objective.evaluate(s.x)), probability=s.probability,
+            status=OptimizationResultStatus.SUCCESS if feasible else OptimizationResultStatus.INFEASIBLE))
+    sense = qp.objective.sense.value
+    samples.sort(key=lambda s: (s.status.value, sense * s.fval))
+    top = samples[0]
+
+    eigenstate = {"".join(map(str, b[::-1])): float(p) for b, p in zip(bits, probs)}
+    return MinimumEigenOptimizationResult(
+        x=top.x, fval=top.fval, variables=qp.variables, status=top.status, samples=samples,
+        min_eigen_solver_result=MultiStartQAOAResult(runs, best, eigenstate, simulator.num_qubits),
+        raw_samples=raw_samples)
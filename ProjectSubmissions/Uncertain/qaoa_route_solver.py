@@ -1,6 +1,4 @@
 import numpy as np
-from qiskit import Aer, execute
-from qiskit.optimization import QuadraticProgram
 from qiskit.algorithms.optimizers import COBYLA
 from qiskit_optimization.algorithms import MinimumEigenOptimizer
 from qiskit.algorithms.minimum_eigensolvers import QAOA
@@ -8,6 +6,10 @@ from qiskit.primitives import Sampler
 from qiskit_optimization.translators import from_docplex_mp
 from docplex.mp.model import Model
 
+from route_qubo import build_route_program
+from qaoa_simulator import DiagonalQAOA
+from qaoa_multistart import multistart_qaoa
+
 # Step 1: Generate a random symmetric distance matrix
 def generate_distance_matrix(num_locations, max_distance=10):
     distance_matrix = np.random.randint(1, max_distance, size=(num_locations, num_locations))
@@ -16,7 +18,11 @@ def generate_distance_matrix(num_locations, max_distance=10):
     return distance_matrix
 
 # Step 2: Generate a QUBO problem for QAOA with proper constraints
-def create_qubo_problem(distance_matrix):
+def create_qubo_problem(distance_matrix, cache=True):
+    # Built from index arrays and cached by matrix hash; same program as the docplex version below
+    return build_route_program(distance_matrix, cache=cache)
+
+def create_qubo_problem_docplex(distance_matrix):
     num_locations = len(distance_matrix)
     mdl = Model("Route Optimization")
     
@@ -47,14 +53,28 @@ def solve_qaoa(qubo_problem):
     result = qaoa_solver.solve(qubo_problem)
     return result
 
+# Step 3b: Exact QAOA on a NumPy statevector (the cost Hamiltonian is diagonal)
+def solve_qaoa_statevector(distance_matrix, reps=2, optimizer=None):
+    simulator = DiagonalQAOA.from_distance_matrix(distance_matrix)
+    params, expectation, _ = simulator.optimize_to_depth(reps, optimizer=optimizer)[-1]
+    bits, _, energies = simulator.most_likely(params)
+    return bits[0], energies[0], params
+
+# Step 3c: Many QAOA runs from random starting points across a process pool
+def solve_qaoa_multistart(qubo_problem, reps=2, num_starts=32, time_budget=None, seed=0):
+    # Same result type as solve_qaoa (MinimumEigenOptimizationResult)
+    return multistart_qaoa(qubo_problem, reps=reps, num_starts=num_starts,
+                           time_budget=time_budget, seed=seed)
+
 # Main Execution
-num_locations = 5
-distance_matrix = generate_distance_matrix(num_locations)
-qubo_problem = create_qubo_problem(distance_matrix)
-result = solve_qaoa(qubo_problem)
-
-# Print Results
-print("Distance Matrix:")
-print(distance_matrix)
-print("\nOptimal Route (Binary Encoding):", result.x)
-print("Optimal Cost:", result.fval)
+if __name__ == "__main__":
+    num_locations = 5
+    distance_matrix = generate_distance_matrix(num_locations)
+    qubo_problem = create_qubo_problem(distance_matrix)
+    result = solve_qaoa(qubo_problem)
+
+    # Print Results
+    print("Distance Matrix:")
+    print(distance_matrix)
+    print("\nOptimal Route (Binary Encoding):", result.x)
+    print("Optimal Cost:", result.fval)
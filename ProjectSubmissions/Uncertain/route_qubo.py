@@ -0,0 +1,148 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse as sp
+from qiskit.quantum_info import PauliList, SparsePauliOp
+from qiskit_optimization import QuadraticProgram
+
+# Direct builders for the route model of qaoa_route_solver.py.
+#
+# Variable x[i*n + j] (named x_i_j) means city i is visited at position j.
+# The objective sum_{i != k, j} d[i][k] x[i, j] x[k, (j+1) % n] is the
+# sparse matrix kron(D, P), where P is the cyclic "next position" shift, and
+# the two families of one-hot constraints are the rows of
+#     A = [kron(I, 1^T); kron(1^T, I)].
+# Everything is assembled with index arithmetic instead of docplex expression
+# trees, and results are cached by a hash of the distance matrix.
+
+CACHE_SIZE = 32
+_cache = OrderedDict()
+
+
+def matrix_key(distance_matrix):
+    """Hash of a distance matrix (shape, dtype and contents)."""
+    d = np.ascontiguousarray(distance_matrix)
+    return hashlib.sha1(repr((d.shape, d.dtype.str)).encode() + d.tobytes()).hexdigest()
+
+
+def _cached(kind, distance_matrix, build, *args):
+    key = (kind, matrix_key(distance_matrix)) + args
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+    value = build(np.asarray(distance_matrix), *args)
+    _cache[key] = value
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return value
+
+
+def clear_cache():
+    _cache.clear()
+
+
+def objective_matrix(distance_matrix):
+    """Sparse (n^2 x n^2) matrix of the route-length objective, energy = x^T M x."""
+    d = np.array(distance_matrix, dtype=float)
+    n = len(d)
+    np.fill_diagonal(d, 0.0)
+    shift = sp.csr_matrix((np.ones(n), (np.arange(n), (np.arange(n) + 1) % n)), shape=(n, n))
+    M = sp.kron(sp.csr_matrix(d), shift, format="csr")
+    M.eliminate_zeros()
+    return M
+
+
+def constraint_matrix(n):
+    """Sparse (2n x n^2) matrix whose rows are the one-hot constraints (each row sums to 1)."""
+    ones = sp.csr_matrix(np.ones((1, n)))
+    eye = sp.identity(n, format="csr")
+    return sp.vstack([sp.kron(eye, ones), sp.kron(ones, eye)], format="csr")
+
+
+def default_penalty(distance_matrix):
+    """The penalty QuadraticProgramToQubo picks for this model: 1 + sum of objective coefficients."""
+    return 1.0 + objective_matrix(distance_matrix).sum()
+
+
+def _build_program(d):
+    n = len(d)
+    qp = QuadraticProgram("Route Optimization")
+    for i in range(n):
+        for j in range(n):
+            qp.binary_var(name=f"x_{i}_{j}")
+    qp.minimize(quadratic=objective_matrix(d).todok())
+    A = constraint_matrix(n)
+    for r in range(2 * n):
+        row = A.getrow(r)
+        qp.linear_constraint(linear=dict(zip(row.indices.tolist(), row.data.tolist())),
+                             sense="==", rhs=1, name=f"c{r}")
+    return qp
+
+
+def build_route_program(distance_matrix, cache=True):
+    """QuadraticProgram equivalent to create_qubo_problem, built from index arrays.
+
+    Cached programs are shared between calls; treat them as read-only.
+    """
+    if not cache:
+        return _build_program(np.asarray(distance_matrix))
+    return _cached("program", distance_matrix, _build_program)
+
+
+def _build_qubo(d, penalty):
+    """Upper-triangular QUBO matrix (diagonal = linear terms) and constant offset."""
+    n = len(d)
+    penalty = default_penalty(d) if penalty is None else penalty
+    A = constraint_matrix(n)
+    # penalty * (1 - a.x)^2 = penalty * (1 - 2 a.x + x^T a a^T x), and x_u^2 = x_u
+    M = objective_matrix(d) + penalty * (A.T @ A)
+    M = M.tocsr()
+    linear = M.diagonal() - 2 * penalty * np.asarray(A.sum(axis=0)).ravel()
+    U = sp.triu(M + M.T, k=1) + sp.diags(linear)
+    U = sp.csr_matrix(U)
+    U.eliminate_zeros()
+    return U, float(penalty * A.shape[0])
+
+
+def route_qubo(distance_matrix, penalty=None, cache=True):
+    """(U, offset) with energy(x) = x^T U x + offset for the penalised route model."""
+    if not cache:
+        return _build_qubo(np.asarray(distance_matrix), penalty)
+    return _cached("qubo", distance_matrix, _build_qubo, penalty)
+
+
+def _build_ising(d, penalty):
+    U, offset = _build_qubo(d, penalty)
+    num_qubits = U.shape[0]
+    # Substitute x = (1 - z) / 2:
+    #   h_u x_u          -> h_u / 2 - h_u / 2 z_u
+    #   J_uv x_u x_v     -> J_uv / 4 (1 - z_u - z_v + z_u z_v)
+    linear = U.diagonal()
+    off = sp.triu(U, k=1).tocoo()
+    z_coeffs = -linear / 2
+    np.add.at(z_coeffs, off.row, -off.data / 4)
+    np.add.at(z_coeffs, off.col, -off.data / 4)
+    constant = offset + linear.sum() / 2 + off.data.sum() / 4
+
+    single = np.flatnonzero(z_coeffs)
+    terms = len(single) + len(off.data)
+    z = np.zeros((terms, num_qubits), dtype=bool)
+    z[np.arange(len(single)), single] = True
+    pair = len(single) + np.arange(len(off.data))
+    z[pair, off.row] = True
+    z[pair, off.col] = True
+    paulis = PauliList.from_symplectic(z, np.zeros_like(z))
+    coeffs = np.concatenate([z_coeffs[single], off.data / 4])
+    return SparsePauliOp(paulis, coeffs).simplify(), float(constant)
+
+
+def route_ising(distance_matrix, penalty=None, cache=True):
+    """(SparsePauliOp, offset) Ising Hamiltonian of the penalised route model.
+
+    Matches qiskit_optimization's to_ising of QuadraticProgramToQubo's output:
+    the energy of bitstring x is <x|H|x> + offset, with variable k on qubit k.
+    """
+    if not cache:
+        return _build_ising(np.asarray(distance_matrix), penalty)
+    return _cached("ising", distance_matrix, _build_ising, penalty)
@@ -0,0 +1,212 @@
+import argparse
+import time
+
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+
+# Local coined quantum walk engine for maze.ipynb (no circuits, no cloud backend).
+#
+# The walker lives on the arcs of the graph: basis state |u -> v> means
+# "at node u, coin pointing at neighbour v", so the Hilbert space has
+# dimension 2|E| for any graph, whatever the node degrees. One step is
+#     coin:   C = block-diagonal, one deg(u) x deg(u) coin per node
+#             (Grover coin 2/d J - I by default, or the d-point DFT)
+#     shift:  S |u -> v> = |v -> u>   (flip-flop shift, a permutation)
+# and U = S C is stored once as a SciPy CSR matrix. Nodes are indexed like
+# get_adjacency_matrix in the notebook (sorted labels); the arcs of node u
+# are the non-zeros of row u of the CSR adjacency matrix.
+#
+# evolve() applies U with sparse mat-vecs (steps * nnz(U) work). For many
+# steps on a small graph, method="squaring" multiplies the state by cached
+# powers U^(2^k) instead (log2(steps) mat-vecs once the powers exist).
+# Powers fill in as the walk spreads, so building them only pays off on
+# small graphs or when the same walk is queried for many step counts
+# (12x12 grid, 2^14 steps: 130 ms stepping, 650 ms first squaring, 1 ms after).
+
+SQUARING_MAX_DIM = 4096
+
+
+def maze_graph(rows, cols):
+    """rows x cols grid with the "(x,y)" labels used by create_maze_graph."""
+    G = nx.grid_2d_graph(rows, cols)
+    return nx.relabel_nodes(G, {(x, y): f"({x},{y})" for x, y in G.nodes()})
+
+
+def _coin_blocks(tail, deg, indptr, coin):
+    """COO entries of the block-diagonal coin operator."""
+    d = deg[tail]
+    rows = np.repeat(np.arange(len(tail)), d)
+    first = np.repeat(indptr[tail], d)
+    local_col = np.arange(len(rows)) - np.repeat(np.cumsum(d) - d, d)
+    cols = first + local_col
+    d_rep = np.repeat(d, d)
+    if coin == "grover":
+        values = 2.0 / d_rep - (rows == cols)
+    elif coin == "dft":
+        local_row = rows - first
+        values = np.exp(2j * np.pi * local_row * local_col / d_rep) / np.sqrt(d_rep)
+    else:
+        raise ValueError(f"Unknown coin {coin!r}; use 'grover' or 'dft'")
+    return values, rows, cols
+
+
+class CoinedQuantumWalk:
+    """Discrete-time coined quantum walk on an undirected networkx graph."""
+
+    def __init__(self, G, coin="grover"):
+        if G.is_directed():
+            raise ValueError("The coined walk needs an undirected graph")
+        G = G.copy()
+        G.remove_edges_from(nx.selfloop_edges(G))
+        try:
+            self.nodes = sorted(G.nodes())
+        except TypeError:
+            self.nodes = list(G.nodes())
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
+        self.coin = coin
+
+        A = nx.to_scipy_sparse_array(G, nodelist=self.nodes, format="csr")
+        A.sort_indices()
+        self.num_nodes = A.shape[0]
+        self.indptr = A.indptr.astype(np.int64)
+        self.head = A.indices.astype(np.int64)
+        self.degree = np.diff(self.indptr)
+        self.tail = np.repeat(np.arange(self.num_nodes), self.degree)
+        self.dim = len(self.head)
+        if np.any(self.degree == 0):
+            raise ValueError("Every node needs at least one neighbour")
+
+        # reverse[e] is the arc v -> u for e = u -> v: read off the transposed arc-id matrix
+        ids = sp.csr_matrix((np.arange(1, self.dim + 1), self.head, self.indptr), shape=A.shape)
+        transposed = ids.T.tocsr()
+        transposed.sort_indices()
+        self.reverse = transposed.data.astype(np.int64) - 1
+
+        values, rows, cols = _coin_blocks(self.tail, self.degree, self.indptr, coin)
+        self.coin_operator = sp.csr_matrix((values, (rows, cols)), shape=(self.dim, self.dim))
+        self._unitary = None
+        self._powers = []
+
+    @property
+    def unitary(self):
+        """One-step operator U = S C as a CSR matrix, built on first use."""
+        if self._unitary is None:
+            self._unitary = self.coin_operator[self.reverse].tocsr()   # row permutation = flip-flop shift
+        return self._unitary
+
+    def initial_state(self, start=None):
+        """Walker at `start` (default: first node) with a uniform coin over its arcs."""
+        u = 0 if start is None else self.node_index[start]
+        psi = np.zeros(self.dim, dtype=complex)
+        psi[self.indptr[u]:self.indptr[u + 1]] = 1 / np.sqrt(self.degree[u])
+        return psi
+
+    def _power(self, k):
+        """U^(2^k), squaring and caching as needed."""
+        if not self._powers:
+            self._powers.append(self.unitary)
+        while len(self._powers) <= k:
+            P = self._powers[-1]
+            self._powers.append((P @ P).tocsr())
+        return self._powers[k]
+
+    def evolve(self, steps, psi=None, start=None, method="auto"):
+        """State after `steps` walk steps, from psi or from initial_state(start).
+
+        method is "matvec" (one sparse mat-vec per step), "squaring" (binary
+        powers of U) or "auto": squaring when the needed powers are already
+        cached, or when dim <= SQUARING_MAX_DIM and steps > dim^2 (about where
+        building the filled-in powers becomes cheaper than stepping).
+        """
+        psi = self.initial_state(start) if psi is None else np.asarray(psi, dtype=complex)
+        if method == "auto":
+            cached = len(self._powers) >= max(steps, 1).bit_length()
+            small = self.dim <= SQUARING_MAX_DIM and steps > self.dim ** 2
+            method = "squaring" if cached or small else "matvec"
+        if method == "matvec":
+            U = self.unitary
+            for _ in range(steps):
+                psi = U @ psi
+        elif method == "squaring":
+            k = 0
+            while steps:
+                if steps & 1:
+                    psi = self._power(k) @ psi
+                steps >>= 1
+                k += 1
+        else:
+            raise ValueError(f"Unknown method {method!r}")
+        return psi
+
+    def node_probabilities(self, psi):
+        """Occupation probability of every node (summed over its coin states)."""
+        return np.bincount(self.tail, weights=psi.real ** 2 + psi.imag ** 2, minlength=self.num_nodes)
+
+    def occupation(self, steps, start=None, method="auto"):
+        """Node occupation probabilities after `steps` steps."""
+        return self.node_probabilities(self.evolve(steps, start=start, method=method))
+
+    def occupation_history(self, steps, start=None):
+        """(steps + 1, num_nodes) array of node probabilities after 0..steps steps."""
+        psi = self.initial_state(start)
+        history = np.empty((steps + 1, self.num_nodes))
+        history[0] = self.node_probabilities(psi)
+        U = self.unitary
+        for t in range(1, steps + 1):
+            psi = U @ psi
+            history[t] = self.node_probabilities(psi)
+        return history
+
+    def top_nodes(self, probs, k=5):
+        """[(node, percent)] of the k most likely nodes, like interpret_quantum_walk."""
+        order = np.argsort(probs)[::-1][:k]
+        return [(self.nodes[i], 100 * float(probs[i])) for i in order]
+
+
+def local_walk_solver(G, steps=3, start=None, coin="grover", k=5):
+    """Offline replacement for quantum_walk_solver: exact node probabilities instead of shot counts.
+
+    Returns (probabilities dict {node: p}, high_prob_nodes, walk); high_prob_nodes
+    plugs into generate_path_from_quantum_walk and draw_maze.
+    """
+    walk = CoinedQuantumWalk(G, coin)
+    probs = walk.occupation(steps, start=start)
+    return dict(zip(walk.nodes, probs)), walk.top_nodes(probs, k), walk
+
+
+def benchmark(rows=64, cols=64, steps=500, coin="grover", squaring_size=12):
+    """Times building and walking a rows x cols grid, and matvec vs squaring on a small grid."""
+    G = maze_graph(rows, cols)
+    start = time.perf_counter()
+    walk = CoinedQuantumWalk(G, coin)
+    U = walk.unitary
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    probs = walk.occupation(steps, start="(0,0)", method="matvec")
+    walked = time.perf_counter() - start
+    print(f"{rows}x{cols} grid: {walk.num_nodes} nodes, {walk.dim} arcs, nnz(U) = {U.nnz}")
+    print(f"  build unitary        {1e3 * built:9.2f} ms")
+    print(f"  {steps} steps (matvec)  {1e3 * walked:9.2f} ms   total probability {probs.sum():.12f}")
+
+    small = CoinedQuantumWalk(maze_graph(squaring_size, squaring_size), coin)
+    long_steps = 1 << 14
+    for method in ("matvec", "squaring", "squaring"):
+        start = time.perf_counter()
+        p = small.occupation(long_steps, start="(0,0)", method=method)
+        print(f"  {squaring_size}x{squaring_size} grid, {long_steps} steps ({method:<8}) "
+              f"{1e3 * (time.perf_counter() - start):9.2f} ms   max p {p.max():.6f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sparse coined quantum walk on grid graphs.")
+    parser.add_argument("--rows", type=int, default=64)
+    parser.add_argument("--cols", type=int, default=64)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--coin", choices=["grover", "dft"], default="grover")
+    args = parser.parse_args(argv)
+    benchmark(args.rows, args.cols, args.steps, args.coin)
+
+
+if __name__ == "__main__":
+    main()